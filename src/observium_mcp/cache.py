@@ -0,0 +1,89 @@
+"""Small in-process TTL caches for expensive, slowly changing lookups."""
+
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe mapping whose entries expire after a per-entry TTL.
+
+    When ``maxsize`` is reached the least recently used entry is evicted.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """Store value under key for ttl seconds."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._data.clear()
+
+
+def ttl_cache(
+    ttl: float,
+    maxsize: int = 1024,
+    enabled: Optional[Callable[[], bool]] = None,
+    should_cache: Optional[Callable[[Any], bool]] = None,
+) -> Callable:
+    """
+    Memoize a function's results for ttl seconds.
+
+    Args:
+        ttl: Seconds a result stays valid
+        maxsize: Maximum number of cached results
+        enabled: Optional predicate checked on every call; caching is bypassed
+                 when it returns False
+        should_cache: Optional predicate deciding whether a result is stored
+                      (e.g. to skip error results)
+
+    Cached results are shared between callers and must not be mutated.
+    The underlying cache is available as ``wrapper.cache``.
+    """
+    def decorator(fn: Callable) -> Callable:
+        cache = TTLCache(maxsize)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if enabled is not None and not enabled():
+                return fn(*args, **kwargs)
+
+            key = (args, tuple(sorted(kwargs.items())))
+            value = cache.get(key, _MISSING)
+            if value is _MISSING:
+                value = fn(*args, **kwargs)
+                if should_cache is None or should_cache(value):
+                    cache.set(key, value, ttl)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
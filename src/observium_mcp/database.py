@@ -1,15 +1,27 @@
 """Database connection and query handling for Observium MySQL/MariaDB database."""
 
+import asyncio
+import collections
+import functools
 import os
+import queue
+import threading
+import time
 from contextlib import contextmanager
 from typing import Any, Generator, Optional
 
 import pymysql
-from pymysql.cursors import DictCursor
+from pymysql.cursors import DictCursor, SSCursor, SSDictCursor
 
 
 def get_db_config() -> dict[str, Any]:
     """Get database configuration from environment variables."""
+    return dict(_read_db_config())
+
+
+@functools.lru_cache(maxsize=1)
+def _read_db_config() -> dict[str, Any]:
+    """Read the database configuration once; get_db_config hands out copies."""
     return {
         "host": os.getenv("OBSERVIUM_DB_HOST", "localhost"),
         "port": int(os.getenv("OBSERVIUM_DB_PORT", "3306")),
@@ -17,18 +29,179 @@ def get_db_config() -> dict[str, Any]:
         "user": os.getenv("OBSERVIUM_DB_USER", "observium"),
         "password": os.getenv("OBSERVIUM_DB_PASS", ""),
         "charset": "utf8mb4",
+        # Pooled connections are long-lived; without autocommit InnoDB would keep
+        # serving every later SELECT from the snapshot taken by the first one.
+        "autocommit": True,
     }
 
 
+class ConnectionPool:
+    """Thread-safe pool of authenticated PyMySQL connections.
+
+    Idle connections are kept in a LIFO queue so the most recently used (and
+    therefore most likely still alive) socket is handed out first. Connections
+    idle for more than ``ping_after`` seconds are pinged on checkout and
+    transparently reopened if the server dropped them; recently used ones are
+    handed out as-is, saving a round trip per query during bursts.
+    Checkouts beyond ``size`` open extra connections, which are closed on return.
+    With ``max_connections`` set, at most that many connections are checked out
+    at once; further checkouts wait up to ``timeout`` seconds for one to return.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        ping_after: float = 30,
+        max_connections: int = 0,
+        timeout: float = 30,
+        **config: Any,
+    ):
+        self._config = config
+        self._ping_after = ping_after
+        self._timeout = timeout
+        self._idle: queue.LifoQueue = queue.LifoQueue(maxsize=size)
+        self._slots = threading.BoundedSemaphore(max_connections) if max_connections > 0 else None
+
+    def get(self) -> pymysql.Connection:
+        """Check out a connection, reusing an idle one when available."""
+        if self._slots is not None and not self._slots.acquire(timeout=self._timeout):
+            raise pymysql.OperationalError(
+                f"No database connection became available within {self._timeout:g}s"
+            )
+        try:
+            return self._checkout()
+        except BaseException:
+            self._release_slot()
+            raise
+
+    def _checkout(self) -> pymysql.Connection:
+        """Take an idle connection (pinging it if it sat long) or open a new one."""
+        try:
+            conn, returned_at = self._idle.get_nowait()
+        except queue.Empty:
+            return pymysql.connect(**self._config)
+
+        if time.monotonic() - returned_at < self._ping_after:
+            return conn
+
+        try:
+            conn.ping(reconnect=True)
+        except pymysql.Error:
+            self._close(conn)
+            return pymysql.connect(**self._config)
+        return conn
+
+    def put(self, conn: pymysql.Connection) -> None:
+        """Return a checked-out connection to the pool."""
+        try:
+            self._idle.put_nowait((conn, time.monotonic()))
+        except queue.Full:
+            self._close(conn)
+        self._release_slot()
+
+    def discard(self, conn: pymysql.Connection) -> None:
+        """Close a checked-out connection instead of returning it to the pool."""
+        self._close(conn)
+        self._release_slot()
+
+    def _release_slot(self) -> None:
+        """Let another checkout proceed when max_connections is set."""
+        if self._slots is not None:
+            self._slots.release()
+
+    @staticmethod
+    def _close(conn: pymysql.Connection) -> None:
+        """Close a connection, ignoring errors from an already dead socket."""
+        try:
+            conn.close()
+        except pymysql.Error:
+            pass
+
+    def warm(self, count: int) -> int:
+        """
+        Open up to count idle connections ahead of use; returns how many opened.
+
+        Stops at the first connection error, leaving it to be reported by the
+        first query instead.
+        """
+        opened = 0
+        for _ in range(min(count, self._idle.maxsize - self._idle.qsize())):
+            try:
+                conn = pymysql.connect(**self._config)
+            except pymysql.Error:
+                break
+            try:
+                self._idle.put_nowait((conn, time.monotonic()))
+            except queue.Full:
+                self._close(conn)
+                break
+            opened += 1
+        return opened
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        while True:
+            try:
+                self._close(self._idle.get_nowait()[0])
+            except queue.Empty:
+                break
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Get the process-wide connection pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                size = int(os.getenv("OBSERVIUM_DB_POOL_SIZE", "10"))
+                _pool = ConnectionPool(
+                    size,
+                    ping_after=float(os.getenv("OBSERVIUM_DB_PING_AFTER", "30")),
+                    max_connections=int(os.getenv("OBSERVIUM_DB_MAX_CONNECTIONS", "0")),
+                    timeout=float(os.getenv("OBSERVIUM_DB_POOL_TIMEOUT", "30")),
+                    **get_db_config(),
+                )
+    return _pool
+
+
+def warm_pool() -> int:
+    """Open OBSERVIUM_DB_POOL_WARM pooled connections now (default: none)."""
+    count = int(os.getenv("OBSERVIUM_DB_POOL_WARM", "0"))
+    return get_pool().warm(count) if count > 0 else 0
+
+
+def close_pool() -> None:
+    """Close all pooled connections (e.g. on server shutdown)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+def reload_config() -> None:
+    """Re-read database settings from the environment and drop pooled connections."""
+    _read_db_config.cache_clear()
+    close_pool()
+
+
 @contextmanager
 def get_connection() -> Generator[pymysql.Connection, None, None]:
-    """Context manager for database connections."""
-    config = get_db_config()
-    conn = pymysql.connect(**config)
+    """Context manager that checks a connection out of the pool."""
+    pool = get_pool()
+    conn = pool.get()
     try:
         yield conn
-    finally:
-        conn.close()
+    except BaseException:
+        # The connection may be mid-result; don't hand it to the next caller
+        pool.discard(conn)
+        raise
+    else:
+        pool.put(conn)
 
 
 @contextmanager
@@ -43,17 +216,91 @@ def get_cursor(dictionary: bool = True) -> Generator[pymysql.cursors.Cursor, Non
             cursor.close()
 
 
+def paginate(query: str, params: list, limit: Optional[int], offset: int = 0) -> str:
+    """
+    Append a LIMIT/OFFSET clause for one page of results to query.
+
+    No clause is added when limit is None and offset is 0; the bound values
+    are appended to params.
+    """
+    if limit is None and not offset:
+        return query
+    # MySQL has no OFFSET without LIMIT; this is its documented "no limit" value
+    params.extend([18446744073709551615 if limit is None else limit, offset])
+    return query + " LIMIT %s OFFSET %s"
+
+
 def execute_query(
     query: str,
     params: Optional[tuple] = None,
     dictionary: bool = True
 ) -> list[dict[str, Any]] | list[tuple]:
-    """Execute a query and return all results."""
+    """Execute a query and return all results.
+
+    PyMySQL's buffered cursors read the whole result during execute(), so
+    fetchall() is a single slice. Use execute_iter() to stream large results.
+
+    Parameters are escaped and interpolated client-side: PyMySQL only speaks
+    the text protocol, so there are no server-side prepared statements to
+    reuse. Keeping query text constant (placeholders, not formatted values)
+    still matters, as it keeps per-digest stats in performance_schema useful.
+    """
     with get_cursor(dictionary=dictionary) as cursor:
         cursor.execute(query, params or ())
         return cursor.fetchall()
 
 
+def execute_query_named(query: str, params: Optional[tuple] = None) -> list[tuple]:
+    """
+    Execute a query and return all results as namedtuples.
+
+    The row type is built once from the result's column names, so rows are
+    created without DictCursor's per-row dict; fields are reachable both by
+    name and by position. Column names that aren't valid identifiers (e.g.
+    COUNT(*) without an alias) are renamed to _0, _1, ...
+    """
+    with get_cursor(dictionary=False) as cursor:
+        cursor.execute(query, params or ())
+        if cursor.description is None:
+            return []
+        row_type = collections.namedtuple(
+            "Row", [d[0] for d in cursor.description], rename=True
+        )
+        return list(map(row_type._make, cursor.fetchall()))
+
+
+def execute_iter(
+    query: str,
+    params: Optional[tuple] = None,
+    dictionary: bool = True,
+    chunksize: int = 1000
+) -> Generator[dict[str, Any] | tuple, None, None]:
+    """
+    Execute a query and yield rows as they arrive from the server.
+
+    Uses an unbuffered (server-side) cursor, so memory stays flat regardless of
+    result size and the first row is available before the last one is sent.
+    Rows are read chunksize at a time with fetchmany(), which skips the
+    per-row fetchone() call of iterating the cursor.
+    The pooled connection is held until the generator is exhausted or closed.
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor(SSDictCursor if dictionary else SSCursor)
+        try:
+            cursor.execute(query, params or ())
+            while True:
+                rows = cursor.fetchmany(chunksize)
+                if not rows:
+                    break
+                yield from rows
+        except GeneratorExit:
+            # Caller stopped early; closing the cursor drains the rest of the
+            # result so the connection can go back to the pool
+            return
+        finally:
+            cursor.close()
+
+
 def execute_single(
     query: str,
     params: Optional[tuple] = None,
@@ -63,3 +310,21 @@ def execute_single(
     with get_cursor(dictionary=dictionary) as cursor:
         cursor.execute(query, params or ())
         return cursor.fetchone()
+
+
+async def aexecute_query(
+    query: str,
+    params: Optional[tuple] = None,
+    dictionary: bool = True
+) -> list[dict[str, Any]] | list[tuple]:
+    """Async variant of execute_query, run on a pooled connection in a worker thread."""
+    return await asyncio.to_thread(execute_query, query, params, dictionary)
+
+
+async def aexecute_single(
+    query: str,
+    params: Optional[tuple] = None,
+    dictionary: bool = True
+) -> Optional[dict[str, Any] | tuple]:
+    """Async variant of execute_single, run on a pooled connection in a worker thread."""
+    return await asyncio.to_thread(execute_single, query, params, dictionary)
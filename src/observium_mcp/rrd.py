@@ -4,29 +4,54 @@ Supports both local and remote (SSH) access to RRD files.
 For remote access, set OBSERVIUM_RRD_SSH_HOST in your .env file.
 """
 
+import asyncio
+import concurrent.futures
+import functools
 import os
+import queue
+import re
+import select
+import shlex
+import socket
 import subprocess
-from datetime import datetime, timedelta
-from typing import Any, Optional
+import threading
+import time
+import xml.etree.ElementTree as ET
+from typing import Any, Optional, Union
 
+from .cache import ttl_cache
 
+
+@functools.lru_cache(maxsize=1)
 def get_ssh_config() -> dict[str, Optional[str]]:
-    """Get SSH configuration for remote RRD access."""
+    """Get SSH configuration for remote RRD access (read once; do not mutate)."""
     return {
         "host": os.getenv("OBSERVIUM_RRD_SSH_HOST"),
         "user": os.getenv("OBSERVIUM_RRD_SSH_USER", "pi"),
         "port": os.getenv("OBSERVIUM_RRD_SSH_PORT", "22"),
         "key": os.getenv("OBSERVIUM_RRD_SSH_KEY"),  # Optional: path to SSH key
+        # Multiplex all SSH calls over one persistent master connection;
+        # set OBSERVIUM_RRD_SSH_CONTROL_PATH to an empty value to disable
+        "control_path": os.getenv(
+            "OBSERVIUM_RRD_SSH_CONTROL_PATH", "~/.ssh/observium-mcp-%r@%h:%p"
+        ),
+        "control_persist": os.getenv("OBSERVIUM_RRD_SSH_CONTROL_PERSIST", "600"),
     }
 
 
+@functools.lru_cache(maxsize=1)
 def is_remote_mode() -> bool:
     """Check if we should use SSH for remote RRD access."""
     return bool(os.getenv("OBSERVIUM_RRD_SSH_HOST"))
 
 
-def build_ssh_cmd(cmd: list[str]) -> list[str]:
-    """Build an SSH command to run remotely."""
+# Options for non-interactive use
+_SSH_OPTS = ("-o", "BatchMode=yes", "-o", "StrictHostKeyChecking=accept-new")
+
+
+@functools.lru_cache(maxsize=1)
+def _ssh_prefix() -> tuple[str, ...]:
+    """Build the fixed part of every SSH command (everything but the remote command)."""
     ssh_config = get_ssh_config()
     ssh_cmd = ["ssh"]
 
@@ -36,19 +61,46 @@ def build_ssh_cmd(cmd: list[str]) -> list[str]:
     if ssh_config["key"]:
         ssh_cmd.extend(["-i", ssh_config["key"]])
 
-    # Add options for non-interactive use
-    ssh_cmd.extend(["-o", "BatchMode=yes", "-o", "StrictHostKeyChecking=accept-new"])
+    ssh_cmd.extend(_SSH_OPTS)
+
+    # Reuse an authenticated master connection so each call skips the TCP
+    # handshake, key exchange and user auth. The first call becomes the master
+    # and keeps running in the background for ControlPersist seconds.
+    if ssh_config["control_path"]:
+        ssh_cmd.extend([
+            "-o", "ControlMaster=auto",
+            "-o", f"ControlPath={ssh_config['control_path']}",
+            "-o", f"ControlPersist={ssh_config['control_persist']}",
+        ])
 
     # Add user@host
-    target = f"{ssh_config['user']}@{ssh_config['host']}"
-    ssh_cmd.append(target)
+    ssh_cmd.append(f"{ssh_config['user']}@{ssh_config['host']}")
 
-    # Add the actual command
-    ssh_cmd.extend(cmd)
+    return tuple(ssh_cmd)
 
-    return ssh_cmd
+
+def build_ssh_cmd(cmd: list[str]) -> list[str]:
+    """
+    Build an SSH command to run remotely.
+
+    The remote side hands the command to a shell, so each argument is quoted
+    to arrive there exactly as given.
+    """
+    return [*_ssh_prefix(), shlex.join(cmd)]
 
 
+@functools.lru_cache(maxsize=1)
+def rrd_cache_enabled() -> bool:
+    """Check if RRD results should be cached in memory (OBSERVIUM_RRD_CACHE=1)."""
+    return os.getenv("OBSERVIUM_RRD_CACHE", "0").lower() in ("1", "true", "yes")
+
+
+def _is_ok(result: dict[str, Any]) -> bool:
+    """Only cache successful RRD results."""
+    return "error" not in result
+
+
+@functools.lru_cache(maxsize=1)
 def get_rrd_path() -> str:
     """Get the base RRD path from environment."""
     return os.getenv("OBSERVIUM_RRD_PATH", "/opt/observium/rrd")
@@ -59,25 +111,32 @@ def get_device_rrd_path(hostname: str) -> str:
     return os.path.join(get_rrd_path(), hostname)
 
 
-def remote_path_exists(path: str) -> bool:
-    """Check if a path exists on the remote server."""
-    # Use shell=True equivalent by passing command as a single string to remote shell
-    cmd = build_ssh_cmd([f"test -e '{path}'"])
+def remote_stat(path: str) -> Optional[str]:
+    """
+    Get the type of a path on the remote server in one SSH round trip.
+
+    Returns:
+        The `stat -c %F` file type (e.g. 'directory', 'regular file'),
+        or None if the path does not exist
+    """
+    cmd = build_ssh_cmd(["stat", "-c", "%F", "--", path])
     try:
         result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-        return result.returncode == 0
+        if result.returncode == 0:
+            return result.stdout.strip() or None
+        return None
     except Exception:
-        return False
+        return None
+
+
+def remote_path_exists(path: str) -> bool:
+    """Check if a path exists on the remote server."""
+    return remote_stat(path) is not None
 
 
 def remote_is_dir(path: str) -> bool:
     """Check if a path is a directory on the remote server."""
-    cmd = build_ssh_cmd([f"test -d '{path}'"])
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-        return result.returncode == 0
-    except Exception:
-        return False
+    return remote_stat(path) == "directory"
 
 
 def remote_list_dir(path: str) -> list[str]:
@@ -92,21 +151,63 @@ def remote_list_dir(path: str) -> list[str]:
         return []
 
 
+def remote_stat_many(paths: list[str]) -> dict[str, Optional[str]]:
+    """
+    Check several paths on the remote server in a single SSH round trip.
+
+    Returns:
+        Dictionary mapping each path to 'directory', 'file', or None if missing
+    """
+    if not paths:
+        return {}
+
+    quoted = " ".join(shlex.quote(p) for p in paths)
+    script = (
+        f"for p in {quoted}; do "
+        'if [ -d "$p" ]; then echo d; elif [ -e "$p" ]; then echo f; else echo -; fi; '
+        "done"
+    )
+    cmd = build_ssh_cmd(["sh", "-c", script])
+    kinds = {"d": "directory", "f": "file"}
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        if result.returncode != 0:
+            return {p: None for p in paths}
+        lines = result.stdout.split()
+        return {p: kinds.get(lines[i]) if i < len(lines) else None for i, p in enumerate(paths)}
+    except Exception:
+        return {p: None for p in paths}
+
+
 def list_device_rrd_files(hostname: str) -> list[str]:
     """List all RRD files for a device."""
     device_path = get_device_rrd_path(hostname)
 
     if is_remote_mode():
-        # Remote mode: use SSH
-        if not remote_is_dir(device_path):
-            return []
+        # Remote mode: use SSH. A missing directory makes `ls` fail, which
+        # already yields an empty list, so no separate `test -d` round trip.
         files = remote_list_dir(device_path)
         return [f for f in files if f.endswith(".rrd")]
     else:
-        # Local mode
-        if not os.path.isdir(device_path):
+        # Local mode: scandir streams entries, and a missing directory is
+        # handled by the exception instead of a separate isdir() stat
+        try:
+            with os.scandir(device_path) as entries:
+                return [e.name for e in entries if e.name.endswith(".rrd")]
+        except (FileNotFoundError, NotADirectoryError):
             return []
-        return [f for f in os.listdir(device_path) if f.endswith(".rrd")]
+
+
+@ttl_cache(ttl=60, enabled=rrd_cache_enabled, should_cache=bool)
+def device_rrd_file_set(hostname: str) -> frozenset[str]:
+    """
+    Get the names of a device's RRD files as a set, for membership tests.
+
+    Only worth it while cached (probe_rrd_files uses it when OBSERVIUM_RRD_CACHE
+    is on); uncached, listing a large directory costs more than a stat or
+    two. Empty listings, which may come from a failed SSH call, are not cached.
+    """
+    return frozenset(list_device_rrd_files(hostname))
 
 
 def rrd_file_exists(rrd_file: str) -> bool:
@@ -117,6 +218,530 @@ def rrd_file_exists(rrd_file: str) -> bool:
         return os.path.exists(rrd_file)
 
 
+def rrd_files_exist(rrd_files: list[str]) -> dict[str, bool]:
+    """Check several RRD files at once (one SSH round trip in remote mode)."""
+    if is_remote_mode():
+        return {path: kind is not None for path, kind in remote_stat_many(rrd_files).items()}
+    else:
+        return {path: os.path.exists(path) for path in rrd_files}
+
+
+def probe_rrd_files(hostname: str, files: list[str]) -> dict[str, bool]:
+    """
+    Check which of a device's RRD files exist.
+
+    Args:
+        hostname: Device hostname
+        files: RRD file names relative to the device directory
+
+    Returns:
+        Dictionary mapping each file name to whether it exists
+    """
+    if rrd_cache_enabled():
+        # The cached listing answers without touching the disk (or SSH)
+        listing = device_rrd_file_set(hostname)
+        if listing:
+            return {f: f in listing for f in files}
+
+    device_path = get_device_rrd_path(hostname)
+    paths = [os.path.join(device_path, f) for f in files]
+    exists = rrd_files_exist(paths)
+    return {f: exists[p] for f, p in zip(files, paths)}
+
+
+@functools.lru_cache(maxsize=1)
+def rrd_concurrency() -> int:
+    """Get the maximum number of RRD commands to run at once (OBSERVIUM_SSH_CONCURRENCY)."""
+    return max(1, int(os.getenv("OBSERVIUM_SSH_CONCURRENCY", "16")))
+
+
+@functools.lru_cache(maxsize=1)
+def rrdcached_address() -> Optional[str]:
+    """Get the rrdcached address to pass as --daemon (OBSERVIUM_RRDCACHED), if any."""
+    return os.getenv("OBSERVIUM_RRDCACHED") or None
+
+
+@functools.lru_cache(maxsize=1)
+def rrdcached_fetch_enabled() -> bool:
+    """Check if fetches should go to rrdcached's socket directly (OBSERVIUM_RRDCACHED_FETCH)."""
+    return os.getenv("OBSERVIUM_RRDCACHED_FETCH", "0").lower() in ("1", "true", "yes")
+
+
+def rrdcached_socket_path() -> Optional[str]:
+    """
+    Return the Unix socket to send FETCH commands to, or None.
+
+    Only local mode with a unix: (or bare path) OBSERVIUM_RRDCACHED address
+    qualifies; rrdcached resolves the file names itself, so they must be
+    valid on this host.
+    """
+    if not rrdcached_fetch_enabled() or is_remote_mode():
+        return None
+    address = rrdcached_address() or ""
+    if address.startswith("unix:"):
+        return address[5:]
+    if address.startswith("/"):
+        return address
+    return None
+
+
+# Only windows up to this long go through rrdcached (see daemon_args)
+RRDCACHED_MAX_WINDOW = 86400
+
+# Relative rrdtool times we can size without a clock: -300, -30s, -5min, -6h, -1d, -1w
+_RELATIVE_TIME_RE = re.compile(r"^-(\d+)(s|sec|min|h|hours?|d|days?|w|weeks?)?$")
+_UNIT_SECONDS = {"s": 1, "sec": 1, "min": 60, "h": 3600, "hour": 3600, "hours": 3600,
+                 "d": 86400, "day": 86400, "days": 86400,
+                 "w": 604800, "week": 604800, "weeks": 604800}
+
+
+def _window_seconds(start: Optional[str], end: Optional[str]) -> Optional[int]:
+    """Return the length of a fetch window ending now, or None if it can't be told."""
+    if end not in (None, "", "now"):
+        return None
+    start = str(start or "-1d")
+    m = _RELATIVE_TIME_RE.match(start)
+    if m:
+        return int(m.group(1)) * _UNIT_SECONDS[m.group(2) or "s"]
+    if start.isdigit():
+        return max(0, int(time.time()) - int(start))
+    return None
+
+
+def daemon_args(start: Optional[str] = None, end: Optional[str] = None) -> list[str]:
+    """
+    Return ["--daemon", address] when a read should go through rrdcached.
+
+    With --daemon rrdtool first flushes the file's pending updates, so recent
+    data includes samples rrdcached is still holding in memory, and hot files
+    are read straight from the page cache. Long ranges gain nothing from that
+    and the flush round trip can make them slower, so only windows ending now
+    and no longer than RRDCACHED_MAX_WINDOW use it. Pass no times for reads
+    without a range (info, lastupdate).
+    """
+    address = rrdcached_address()
+    if not address:
+        return []
+    if start is not None or end is not None:
+        window = _window_seconds(start, end)
+        if window is None or window > RRDCACHED_MAX_WINDOW:
+            return []
+    return ["--daemon", address]
+
+
+class RrdtoolError(Exception):
+    """rrdtool reported an error for a command."""
+
+
+@functools.lru_cache(maxsize=1)
+def rrdtool_pipe_enabled() -> bool:
+    """Check if rrdtool commands should go through a persistent `rrdtool -` process."""
+    return os.getenv("OBSERVIUM_RRDTOOL_PIPE", "0").lower() in ("1", "true", "yes")
+
+
+@functools.lru_cache(maxsize=1)
+def rrdtool_pipes() -> int:
+    """Get the maximum number of persistent rrdtool processes (OBSERVIUM_RRDTOOL_PIPES)."""
+    return max(1, int(os.getenv("OBSERVIUM_RRDTOOL_PIPES", "4")))
+
+
+class RrdtoolWorker:
+    """
+    Long-lived `rrdtool -` process fed commands over stdin.
+
+    rrdtool's pipe mode answers each command with its normal output followed by
+    an `OK u:... s:... r:...` or `ERROR: ...` line, so one process (and in
+    remote mode one SSH session) can serve every fetch/info call instead of a
+    fork+exec per call. The process is restarted if it dies.
+    """
+
+    def __init__(self) -> None:
+        self.proc: Optional[subprocess.Popen] = None
+        self.lock = threading.Lock()
+        self._buffer = b""
+
+    def _start(self) -> None:
+        cmd = ["rrdtool", "-"]
+        if is_remote_mode():
+            cmd = build_ssh_cmd(cmd)
+        self.proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self._buffer = b""
+
+    def _read_line(self, deadline: float) -> bytes:
+        while b"\n" not in self._buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("rrdtool did not answer in time")
+            ready, _, _ = select.select([self.proc.stdout], [], [], remaining)
+            if not ready:
+                continue
+            chunk = os.read(self.proc.stdout.fileno(), 65536)
+            if not chunk:
+                raise EOFError("rrdtool process exited")
+            self._buffer += chunk
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return line
+
+    def run(self, args: list[str], timeout: float = 60) -> bytes:
+        """
+        Run one rrdtool command (without the leading 'rrdtool').
+
+        Returns:
+            The command's raw output
+
+        Raises:
+            RrdtoolError: rrdtool rejected the command
+            OSError, EOFError, TimeoutError: the process could not be used;
+                it is closed and will be restarted on the next call
+        """
+        # Pipe mode splits on whitespace but honours double quotes
+        line = " ".join(f'"{a}"' if any(c.isspace() for c in a) else a for a in args)
+        with self.lock:
+            if self.proc is None or self.proc.poll() is not None:
+                self._start()
+            try:
+                self.proc.stdin.write(line.encode() + b"\n")
+                self.proc.stdin.flush()
+
+                deadline = time.monotonic() + timeout
+                output = []
+                while True:
+                    reply = self._read_line(deadline)
+                    if reply.startswith(b"OK u:") or reply == b"OK":
+                        return b"\n".join(output)
+                    if reply.startswith(b"ERROR"):
+                        raise RrdtoolError(f"rrdtool error: {reply.decode('utf-8', 'replace')}")
+                    output.append(reply)
+            except RrdtoolError:
+                raise
+            except (OSError, EOFError, TimeoutError):
+                self._close()
+                raise
+
+    def _close(self) -> None:
+        if self.proc is not None:
+            try:
+                self.proc.kill()
+                self.proc.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+            self.proc = None
+
+    def close(self) -> None:
+        """Stop the rrdtool process."""
+        with self.lock:
+            self._close()
+
+
+class RrdtoolWorkerPool:
+    """
+    Up to rrdtool_pipes() RrdtoolWorkers, each serving one caller at a time.
+
+    A worker's pipe carries one command/reply exchange at a time, so sharing a
+    single process would serialize concurrent fetches behind its lock. Here
+    each concurrent caller gets its own process; workers are created on
+    demand and the most recently used one is handed out first, so serial use
+    keeps a single process alive.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._workers: list[RrdtoolWorker] = []
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+
+    def _acquire(self, timeout: float) -> RrdtoolWorker:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._workers) < rrdtool_pipes():
+                worker = RrdtoolWorker()
+                self._workers.append(worker)
+                return worker
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError("no rrdtool process became free in time") from None
+
+    def run(self, args: list[str], timeout: float = 60) -> bytes:
+        """Run one rrdtool command on a free worker (see RrdtoolWorker.run)."""
+        worker = self._acquire(timeout)
+        try:
+            return worker.run(args, timeout)
+        finally:
+            self._idle.put(worker)
+
+    def close(self) -> None:
+        """Stop all rrdtool processes; workers restart them on next use."""
+        with self._lock:
+            workers = list(self._workers)
+        for worker in workers:
+            worker.close()
+
+
+_workers = RrdtoolWorkerPool()
+
+
+# (socket path, socket, buffered reader) of one rrdcached connection
+_RrdcachedConn = tuple[str, socket.socket, Any]
+
+
+class RrdcachedClient:
+    """
+    Client for rrdcached's FETCH command over its Unix socket.
+
+    rrdcached (1.5+) flushes pending updates and runs the fetch itself, so a
+    read costs one request/reply on an already open socket instead of an
+    rrdtool process. The protocol carries one exchange at a time, so each
+    fetch checks a connection out of a LIFO idle pool and returns it; at
+    most rrd_concurrency() idle connections are kept, extra ones are closed.
+    """
+
+    def __init__(self) -> None:
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+
+    @staticmethod
+    def _connect(socket_path: str, timeout: float) -> _RrdcachedConn:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(timeout)
+            sock.connect(socket_path)
+        except OSError:
+            sock.close()
+            raise
+        return socket_path, sock, sock.makefile("rb")
+
+    def _checkout(self, socket_path: str, timeout: float) -> Optional[_RrdcachedConn]:
+        """Take an idle connection to socket_path, or None if there is none."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return None
+            if conn[0] == socket_path:
+                conn[1].settimeout(timeout)
+                return conn
+            self._close(conn)  # Opened for an address since reconfigured
+
+    def _checkin(self, conn: _RrdcachedConn) -> None:
+        if self._idle.qsize() >= rrd_concurrency():
+            self._close(conn)
+        else:
+            self._idle.put_nowait(conn)
+
+    @staticmethod
+    def _close(conn: _RrdcachedConn) -> None:
+        _, sock, reader = conn
+        try:
+            reader.close()
+            sock.close()
+        except OSError:
+            pass
+
+    @staticmethod
+    def _exchange(conn: _RrdcachedConn, command: str) -> tuple[int, bytes, list]:
+        """Send one command; returns the reply's status code, message and lines."""
+        _, sock, reader = conn
+        sock.sendall(command.encode() + b"\n")
+        status = reader.readline()
+        if not status.endswith(b"\n"):
+            raise ConnectionError("rrdcached closed the connection")
+        count, _, message = status.strip().partition(b" ")
+        try:
+            count = int(count)
+        except ValueError:
+            raise ConnectionError(f"unexpected rrdcached reply: {status!r}") from None
+        return count, message, [reader.readline() for _ in range(max(count, 0))]
+
+    def fetch(
+        self,
+        socket_path: str,
+        rrd_file: str,
+        cf: str,
+        start: str,
+        end: Optional[str] = None,
+        timeout: float = 60,
+    ) -> dict[str, Any]:
+        """
+        Fetch rrd_file through rrdcached.
+
+        Returns the same structure as parse_rrd_output.
+
+        Raises:
+            RrdtoolError: rrdcached rejected the command (e.g. an unknown
+                file or a path outside its -B base directory)
+            OSError: the socket could not be used; the connection is closed
+        """
+        command = f"FETCH {rrd_file} {cf} {start}" + (f" {end}" if end else "")
+        conn = self._checkout(socket_path, timeout)
+        if conn is not None:
+            try:
+                reply = self._exchange(conn, command)
+            except OSError:
+                # The daemon may have dropped an idle connection; retry once
+                self._close(conn)
+                conn = None
+        if conn is None:
+            conn = self._connect(socket_path, timeout)
+            try:
+                reply = self._exchange(conn, command)
+            except OSError:
+                self._close(conn)
+                raise
+        self._checkin(conn)
+
+        count, message, lines = reply
+        if count < 0:
+            raise RrdtoolError(f"rrdcached error: {message.decode('utf-8', 'replace')}")
+        return parse_rrdcached_fetch(lines)
+
+    def close(self) -> None:
+        """Close all idle connections; fetches reconnect on next use."""
+        while True:
+            try:
+                self._close(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+
+_rrdcached = RrdcachedClient()
+
+
+def close_rrdtool_worker() -> None:
+    """Stop the persistent rrdtool processes and rrdcached connections (e.g. on server shutdown)."""
+    _workers.close()
+    _rrdcached.close()
+
+
+def reload_config() -> None:
+    """Re-read RRD/SSH settings from the environment on next use."""
+    for fn in (get_ssh_config, is_remote_mode, rrd_cache_enabled, get_rrd_path,
+               rrdtool_pipe_enabled, rrdtool_pipes, rrdtool_binding, _ssh_prefix,
+               rrd_concurrency, rrdcached_address, rrdcached_fetch_enabled):
+        fn.cache_clear()
+    # The pipe process was started for the old local/remote settings
+    close_rrdtool_worker()
+
+
+@functools.lru_cache(maxsize=1)
+def rrdtool_binding():
+    """
+    Return the python-rrdtool module for local mode, or None to use the CLI.
+
+    The binding calls librrd in-process, so there is no subprocess to spawn
+    and no text output to parse. It cannot reach a remote RRD host.
+    """
+    if is_remote_mode():
+        return None
+    try:
+        import rrdtool
+    except ImportError:
+        return None
+    return rrdtool
+
+
+# librrd keeps its error message and getopt state in globals
+_binding_lock = threading.Lock()
+
+
+def fetch_with_binding(rrdtool, args: list[str]) -> dict[str, Any]:
+    """
+    Run `rrdtool fetch` through the python-rrdtool binding.
+
+    Returns the same structure as parse_rrd_output.
+
+    Raises:
+        RrdtoolError: librrd reported an error
+    """
+    with _binding_lock:
+        try:
+            (start, _end, step), datasources, rows = rrdtool.fetch(*args)
+        except rrdtool.OperationalError as e:
+            raise RrdtoolError(f"rrdtool error: {e}") from e
+
+    # Like the CLI, each row is stamped with the end of its step
+    return {
+        "datasources": list(datasources),
+        "timestamps": list(range(start + step, start + step * (len(rows) + 1), step)),
+        "data": [list(row) for row in rows],
+    }
+
+
+# Keys of the binding's info() dict that parse_rrd_info's fields come from
+_INFO_KEY_RE = re.compile(r"^ds\[(?P<ds>[^\]]+)\]\.type$")
+
+
+def info_with_binding(rrdtool, args: list[str]) -> dict[str, Any]:
+    """
+    Run `rrdtool info` through the python-rrdtool binding.
+
+    Returns the same structure as parse_rrd_info.
+
+    Raises:
+        RrdtoolError: librrd reported an error
+    """
+    with _binding_lock:
+        try:
+            raw = rrdtool.info(*args)
+        except rrdtool.OperationalError as e:
+            raise RrdtoolError(f"rrdtool error: {e}") from e
+
+    info = {"datasources": [], "rras": []}
+    ds_types: dict[str, str] = {}  # insertion-ordered
+    for key, value in raw.items():
+        m = _INFO_KEY_RE.match(key)
+        if m:
+            ds_types[m.group("ds")] = value
+    if "step" in raw:
+        info["step"] = int(raw["step"])
+    if "last_update" in raw:
+        info["last_update"] = int(raw["last_update"])
+
+    info["datasources"] = list(ds_types)
+    info["ds_types"] = ds_types
+    return info
+
+
+def run_rrdtool(args: list[str], timeout: float = 60) -> bytes:
+    """
+    Run an rrdtool command locally or via SSH and return its raw output.
+
+    Output is left as bytes; rrdtool prints ASCII and the parsers split and
+    convert it without a full-buffer decode.
+
+    Uses a persistent `rrdtool -` process when OBSERVIUM_RRDTOOL_PIPE=1,
+    falling back to a one-off process if no pipe is usable.
+
+    Raises:
+        RrdtoolError: rrdtool reported an error
+        subprocess.TimeoutExpired: the command timed out
+    """
+    if rrdtool_pipe_enabled():
+        try:
+            return _workers.run(args, timeout)
+        except (OSError, EOFError, TimeoutError):
+            pass  # Fall back to a one-off process below
+
+    cmd = ["rrdtool", *args]
+    if is_remote_mode():
+        cmd = build_ssh_cmd(cmd)
+
+    try:
+        result = subprocess.run(cmd, capture_output=True, check=True, timeout=timeout)
+    except subprocess.CalledProcessError as e:
+        raise RrdtoolError(f"rrdtool error: {e.stderr.decode('utf-8', 'replace')}") from e
+    return result.stdout
+
+
+# RRDs are updated once per step (typically 300s), so a 30s TTL bounds staleness
+# well below the data's own resolution while absorbing repeated identical asks.
+@ttl_cache(ttl=30, enabled=rrd_cache_enabled, should_cache=_is_ok)
 def fetch_rrd_data(
     rrd_file: str,
     cf: str = "AVERAGE",
@@ -136,12 +761,20 @@ def fetch_rrd_data(
 
     Returns:
         Dictionary with 'timestamps', 'datasources', and 'data' keys
+
+    In local mode the python-rrdtool binding is used when it is installed.
+    Windows of up to a day are read through rrdcached when OBSERVIUM_RRDCACHED
+    is set (see daemon_args); with OBSERVIUM_RRDCACHED_FETCH=1 they are sent
+    to its socket as FETCH commands, falling back to rrdtool on any error.
+    Results are cached for 30 seconds when OBSERVIUM_RRD_CACHE=1.
     """
-    if not rrd_file_exists(rrd_file):
+    # In remote mode rrdtool reports a missing file itself; probing first
+    # would cost an extra SSH round trip on every call.
+    if not is_remote_mode() and not os.path.exists(rrd_file):
         return {"error": f"RRD file not found: {rrd_file}"}
 
     # Build rrdtool fetch command
-    rrdtool_cmd = ["rrdtool", "fetch", rrd_file, cf]
+    rrdtool_cmd = ["fetch", rrd_file, cf]
 
     if start:
         rrdtool_cmd.extend(["--start", str(start)])
@@ -154,62 +787,197 @@ def fetch_rrd_data(
     if resolution:
         rrdtool_cmd.extend(["--resolution", str(resolution)])
 
-    # Execute locally or via SSH
-    if is_remote_mode():
-        cmd = build_ssh_cmd(rrdtool_cmd)
-    else:
-        cmd = rrdtool_cmd
+    rrdtool_cmd.extend(daemon_args(start or "-1d", end))
+
+    socket_path = rrdcached_socket_path()
+    # The protocol splits on spaces; such names go through rrdtool instead
+    if (socket_path and not resolution and "--daemon" in rrdtool_cmd
+            and not any(c.isspace() for c in rrd_file)):
+        try:
+            return _rrdcached.fetch(socket_path, rrd_file, cf, str(start or "-1d"),
+                                    str(end) if end else None)
+        except (OSError, RrdtoolError):
+            pass  # Fall back to rrdtool below, which reports errors itself
 
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=60)
-        return parse_rrd_output(result.stdout)
-    except subprocess.CalledProcessError as e:
-        return {"error": f"rrdtool error: {e.stderr}"}
+        binding = rrdtool_binding()
+        if binding is not None:
+            return fetch_with_binding(binding, rrdtool_cmd[1:])
+        return parse_rrd_output(run_rrdtool(rrdtool_cmd, timeout=60))
+    except RrdtoolError as e:
+        return {"error": str(e)}
     except subprocess.TimeoutExpired:
         return {"error": "RRD fetch timed out"}
     except Exception as e:
         return {"error": str(e)}
 
 
-def parse_rrd_output(output: str) -> dict[str, Any]:
-    """Parse rrdtool fetch output into structured data."""
-    lines = output.strip().split("\n")
+async def afetch_rrd_data(
+    rrd_file: str,
+    cf: str = "AVERAGE",
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    resolution: Optional[int] = None
+) -> dict[str, Any]:
+    """
+    Async variant of fetch_rrd_data.
+
+    Runs the fetch in a worker thread so the event loop stays free while
+    rrdtool (or SSH) is busy; cache, pipe and remote settings all apply.
+    """
+    return await asyncio.to_thread(fetch_rrd_data, rrd_file, cf, start, end, resolution)
+
+
+async def gather_rrd(
+    rrd_files: list[str],
+    cf: str = "AVERAGE",
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    resolution: Optional[int] = None,
+    concurrency: Optional[int] = None
+) -> dict[str, dict[str, Any]]:
+    """
+    Fetch several RRD files concurrently.
+
+    Args:
+        rrd_files: Full paths to the RRD files
+        cf, start, end, resolution: As for fetch_rrd_data
+        concurrency: Maximum fetches in flight at once (default:
+                     OBSERVIUM_SSH_CONCURRENCY); higher values hide more
+                     latency but put more load on the RRD host
+
+    Returns:
+        Dictionary mapping each file to its fetch_rrd_data result
+    """
+    semaphore = asyncio.Semaphore(concurrency or rrd_concurrency())
+
+    async def fetch_one(rrd_file: str) -> dict[str, Any]:
+        async with semaphore:
+            return await afetch_rrd_data(rrd_file, cf, start, end, resolution)
+
+    results = await asyncio.gather(*(fetch_one(f) for f in rrd_files))
+    return dict(zip(rrd_files, results))
+
+
+def fetch_rrd_files(
+    rrd_files: list[str],
+    cf: str = "AVERAGE",
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    resolution: Optional[int] = None,
+    max_workers: Optional[int] = None
+) -> dict[str, dict[str, Any]]:
+    """
+    Fetch several RRD files concurrently from synchronous code.
+
+    Each file is a separate rrdtool call, run on a thread pool; in remote mode
+    they share the multiplexed SSH master connection. fetch_many_rrd does the
+    same work in one xport call, which is cheaper when the datasources are
+    already known; this costs one round trip per file, but overlapped, and needs
+    no DS discovery.
+
+    Args:
+        rrd_files: Full paths to the RRD files
+        cf, start, end, resolution: As for fetch_rrd_data
+        max_workers: Maximum fetches in flight at once (default:
+                     OBSERVIUM_SSH_CONCURRENCY)
+
+    Returns:
+        Dictionary mapping each file to its fetch_rrd_data result
+    """
+    if len(rrd_files) <= 1:
+        return {f: fetch_rrd_data(f, cf, start, end, resolution) for f in rrd_files}
+
+    workers = min(max_workers or rrd_concurrency(), len(rrd_files))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(lambda f: fetch_rrd_data(f, cf, start, end, resolution), rrd_files)
+        return dict(zip(rrd_files, results))
+
+
+# Spellings of NaN printed by rrdtool across platforms ("U" from lastupdate)
+_NAN_STRINGS = frozenset(("nan", "-nan", "NaN", "-NaN", "NAN", "-NAN", "U"))
+_NAN_BYTES = frozenset(s.encode() for s in _NAN_STRINGS)
+
+
+def _parse_values(fields: Union[list[str], list[bytes]]) -> list[Optional[float]]:
+    """Convert rrdtool value fields to floats, mapping NaN and junk to None."""
+    try:
+        return [None if v in _NAN_STRINGS or v in _NAN_BYTES else float(v) for v in fields]
+    except ValueError:
+        values = []
+        for v in fields:
+            try:
+                x = float(v)
+                values.append(None if x != x else x)
+            except ValueError:
+                values.append(None)
+        return values
+
+
+def parse_rrd_output(output: bytes) -> dict[str, Any]:
+    """Parse raw rrdtool fetch output into structured data."""
+    lines = output.strip().split(b"\n")
     if not lines:
         return {"error": "Empty rrdtool output"}
 
     # First line contains datasource names
-    header = lines[0].strip()
-    datasources = header.split()
+    datasources = lines[0].decode("ascii", "replace").split()
 
     # Remaining lines contain timestamp: values
     data = []
     timestamps = []
 
     for line in lines[1:]:
-        line = line.strip()
-        if not line or ":" not in line:
+        ts, sep, values_str = line.partition(b":")
+        if not sep:
             continue
-
-        parts = line.split(":")
-        if len(parts) != 2:
+        try:
+            timestamp = int(ts)
+        except ValueError:
             continue
 
-        timestamp = int(parts[0].strip())
-        values_str = parts[1].strip().split()
+        timestamps.append(timestamp)
+        values = values_str.split()
+        # Fast path inline; _parse_values only for rows with unparseable fields
+        try:
+            data.append([None if v in _NAN_BYTES else float(v) for v in values])
+        except ValueError:
+            data.append(_parse_values(values))
 
-        # Convert values, handling NaN
-        values = []
-        for v in values_str:
-            try:
-                if v.lower() in ("nan", "-nan"):
-                    values.append(None)
-                else:
-                    values.append(float(v))
-            except ValueError:
-                values.append(None)
+    return {
+        "datasources": datasources,
+        "timestamps": timestamps,
+        "data": data
+    }
 
-        timestamps.append(timestamp)
-        data.append(values)
+
+def parse_rrdcached_fetch(lines: list[bytes]) -> dict[str, Any]:
+    """
+    Parse the body of an rrdcached FETCH reply into structured data.
+
+    The body is a few "Key: value" header lines (FlushVersion, Start, Step,
+    DSCount, DSName, ...) followed by rows in rrdtool's "timestamp: values"
+    format, so rows are stamped with the end of their step as with the CLI.
+    """
+    datasources: list[str] = []
+    data = []
+    timestamps = []
+
+    for line in lines:
+        key, sep, values_str = line.partition(b":")
+        if not sep:
+            continue
+        if not key.isdigit():
+            if key == b"DSName":
+                datasources = values_str.decode("ascii", "replace").split()
+            continue
+
+        timestamps.append(int(key))
+        values = values_str.split()
+        try:
+            data.append([None if v in _NAN_BYTES else float(v) for v in values])
+        except ValueError:
+            data.append(_parse_values(values))
 
     return {
         "datasources": datasources,
@@ -218,64 +986,230 @@ def parse_rrd_output(output: str) -> dict[str, Any]:
     }
 
 
+# DS names and step only change when the RRD schema is edited
+@ttl_cache(ttl=300, enabled=rrd_cache_enabled, should_cache=_is_ok)
 def get_rrd_info(rrd_file: str) -> dict[str, Any]:
-    """Get information about an RRD file."""
-    if not rrd_file_exists(rrd_file):
-        return {"error": f"RRD file not found: {rrd_file}"}
-
-    # Build rrdtool info command
-    rrdtool_cmd = ["rrdtool", "info", rrd_file]
+    """
+    Get information about an RRD file.
 
-    # Execute locally or via SSH
-    if is_remote_mode():
-        cmd = build_ssh_cmd(rrdtool_cmd)
-    else:
-        cmd = rrdtool_cmd
+    In local mode the python-rrdtool binding is used when it is installed.
+    """
+    # In remote mode rrdtool reports a missing file itself; probing first
+    # would cost an extra SSH round trip on every call.
+    if not is_remote_mode() and not os.path.exists(rrd_file):
+        return {"error": f"RRD file not found: {rrd_file}"}
 
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=30)
-        return parse_rrd_info(result.stdout)
-    except subprocess.CalledProcessError as e:
-        return {"error": f"rrdtool error: {e.stderr}"}
+        binding = rrdtool_binding()
+        if binding is not None:
+            return info_with_binding(binding, [*daemon_args(), rrd_file])
+        return parse_rrd_info(run_rrdtool(["info", *daemon_args(), rrd_file], timeout=30))
+    except RrdtoolError as e:
+        return {"error": str(e)}
     except subprocess.TimeoutExpired:
         return {"error": "RRD info timed out"}
     except Exception as e:
         return {"error": str(e)}
 
 
-def parse_rrd_info(output: str) -> dict[str, Any]:
-    """Parse rrdtool info output."""
+# Matches the only `rrdtool info` lines we use: DS type keys, step, last_update
+_INFO_RE = re.compile(
+    rb"^\s*(?:ds\[(?P<ds>[^\]]+)\]\.type\s*=\s*\"(?P<type>[^\"]*)\""
+    rb"|step\s*=\s*(?P<step>\d+)"
+    rb"|last_update\s*=\s*(?P<last_update>\d+))",
+    re.MULTILINE,
+)
+
+
+def parse_rrd_info(output: bytes) -> dict[str, Any]:
+    """Parse raw rrdtool info output."""
     info = {"datasources": [], "rras": []}
-    ds_names = set()
+    ds_types: dict[str, str] = {}  # insertion-ordered
+
+    for m in _INFO_RE.finditer(output):
+        if m.group("ds") is not None:
+            ds = m.group("ds").decode("utf-8", "replace")
+            ds_types[ds] = m.group("type").decode("ascii", "replace")
+        elif m.group("step") is not None:
+            info["step"] = int(m.group("step"))
+        else:
+            info["last_update"] = int(m.group("last_update"))
 
-    for line in output.split("\n"):
-        line = line.strip()
-        if not line or "=" not in line:
-            continue
+    info["datasources"] = list(ds_types)
+    info["ds_types"] = ds_types
+    return info
 
-        key, value = line.split("=", 1)
-        key = key.strip()
-        value = value.strip()
 
-        # Extract datasource names
-        if key.startswith("ds[") and "].type" in key:
-            ds_name = key.split("[")[1].split("]")[0]
-            if ds_name not in ds_names:
-                ds_names.add(ds_name)
-                info["datasources"].append(ds_name)
+def fetch_many_rrd(
+    rrd_files: list[str],
+    cf: str = "AVERAGE",
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    resolution: Optional[int] = None,
+    datasources: Optional[dict[str, list[str]]] = None
+) -> dict[str, dict[str, Any]]:
+    """
+    Fetch several RRD files with a single `rrdtool xport` invocation.
 
-        # Basic info
-        elif key == "step":
-            info["step"] = int(value)
-        elif key == "last_update":
-            info["last_update"] = int(value)
+    One process (and in remote mode one SSH round trip) replaces one
+    `rrdtool fetch` per file.
 
-    return info
+    Args:
+        rrd_files: Full paths to the RRD files
+        cf: Consolidation function (AVERAGE, MIN, MAX, LAST)
+        start: Start time (rrdtool format, default: "-1d")
+        end: End time (rrdtool format, default: now)
+        resolution: Desired resolution in seconds
+        datasources: Optional known DS names per file; files not listed are
+                     looked up with get_rrd_info (cached when OBSERVIUM_RRD_CACHE=1)
+
+    Returns:
+        Dictionary mapping each file to the same shape fetch_rrd_data returns,
+        or to an 'error' dictionary
+    """
+    results: dict[str, dict[str, Any]] = {}
+    columns: list[tuple[str, str]] = []
+    xport_args: list[str] = []
+
+    for i, rrd_file in enumerate(rrd_files):
+        ds_names = (datasources or {}).get(rrd_file)
+        if ds_names is None:
+            info = get_rrd_info(rrd_file)
+            if "error" in info:
+                results[rrd_file] = info
+                continue
+            ds_names = info["datasources"]
+
+        escaped = rrd_file.replace(":", "\\:")
+        for j, ds in enumerate(ds_names):
+            vname = f"v{i}_{j}"
+            xport_args.append(f"DEF:{vname}={escaped}:{ds}:{cf}")
+            xport_args.append(f"XPORT:{vname}:{ds}")
+            columns.append((rrd_file, ds))
+        results[rrd_file] = {"datasources": list(ds_names), "timestamps": [], "data": []}
+
+    if not columns:
+        return results
+
+    # xport consolidates down to --maxrows (default 400); keep fetch's resolution
+    rrdtool_cmd = ["xport", "--start", str(start or "-1d"), "--maxrows", "1000000"]
+    if end:
+        rrdtool_cmd.extend(["--end", str(end)])
+    if resolution:
+        rrdtool_cmd.extend(["--step", str(resolution)])
+    rrdtool_cmd.extend(xport_args)
+
+    try:
+        rows = parse_rrd_xport(run_rrdtool(rrdtool_cmd, timeout=120))
+    except RrdtoolError as e:
+        error = {"error": str(e)}
+        return {f: (r if "error" in r else error) for f, r in results.items()}
+    except subprocess.TimeoutExpired:
+        error = {"error": "RRD xport timed out"}
+        return {f: (r if "error" in r else error) for f, r in results.items()}
+    except Exception as e:
+        error = {"error": str(e)}
+        return {f: (r if "error" in r else error) for f, r in results.items()}
+
+    # Split the combined rows back into per-file series
+    for timestamp, values in rows:
+        per_file: dict[str, list[Optional[float]]] = {}
+        for (rrd_file, _ds), value in zip(columns, values):
+            per_file.setdefault(rrd_file, []).append(value)
+        for rrd_file, file_values in per_file.items():
+            results[rrd_file]["timestamps"].append(timestamp)
+            results[rrd_file]["data"].append(file_values)
+
+    return results
+
+
+def parse_rrd_xport(output: bytes) -> list[tuple[int, list[Optional[float]]]]:
+    """Parse `rrdtool xport` XML output into (timestamp, values) rows."""
+    root = ET.fromstring(output)
+    rows = []
+    for row in root.iter("row"):
+        timestamp = int(row.findtext("t"))
+        rows.append((timestamp, _parse_values([v.text or "" for v in row.iter("v")])))
+    return rows
+
+
+# Observium's default RRD step, used when the real step isn't known cheaply
+DEFAULT_RRD_STEP = 300
+
+
+def fetch_rrd_tail(rrd_file: str, n_steps: int = 2, cf: str = "LAST") -> dict[str, Any]:
+    """
+    Fetch only the newest rows of an RRD file.
+
+    Asking rrdtool for just the last few steps keeps it on the finest RRA
+    and avoids reading older archive blocks off disk.
+
+    Args:
+        rrd_file: Full path to the RRD file
+        n_steps: Number of steps to fetch (the newest row is often still
+                 incomplete, so the default asks for two)
+        cf: Consolidation function (default: LAST)
+
+    Returns:
+        Same shape as fetch_rrd_data
+    """
+    step = DEFAULT_RRD_STEP
+    # Only look up the real step when that doesn't cost an extra rrdtool call
+    if rrd_cache_enabled():
+        info = get_rrd_info(rrd_file)
+        if "error" in info:
+            return info
+        step = info.get("step") or DEFAULT_RRD_STEP
+
+    return fetch_rrd_data(rrd_file, cf=cf, start=f"-{n_steps * step}s", end="now")
+
+
+def fetch_rrd_lastupdate(rrd_file: str) -> dict[str, Any]:
+    """
+    Get the most recent sample of every datasource via `rrdtool lastupdate`.
+
+    lastupdate reads only the file header, never an RRA. The values are the
+    raw inputs, which only equal the stored value for GAUGE datasources.
+
+    Returns:
+        Same shape as fetch_rrd_data, with a single row (or none if rrdtool
+        printed no sample)
+    """
+    try:
+        return parse_rrd_output(run_rrdtool(["lastupdate", *daemon_args(), rrd_file], timeout=30))
+    except RrdtoolError as e:
+        return {"error": str(e)}
+    except subprocess.TimeoutExpired:
+        return {"error": "RRD lastupdate timed out"}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _can_use_lastupdate(rrd_file: str, datasource: Optional[str]) -> bool:
+    """Check whether lastupdate gives the same answer as fetching the tail."""
+    # The DS types are only known for free when get_rrd_info is cached, and
+    # the in-process binding already makes the tail fetch cheap
+    if not rrd_cache_enabled() or rrdtool_binding() is not None:
+        return False
+    info = get_rrd_info(rrd_file)
+    ds_types = info.get("ds_types")
+    if not ds_types:
+        return False
+    if datasource:
+        return ds_types.get(datasource) == "GAUGE"
+    return all(t == "GAUGE" for t in ds_types.values())
 
 
 def get_last_value(rrd_file: str, datasource: Optional[str] = None) -> dict[str, Any]:
     """Get the last recorded value from an RRD file."""
-    data = fetch_rrd_data(rrd_file, cf="LAST", start="-5m")
+    data = None
+    if _can_use_lastupdate(rrd_file, datasource):
+        data = fetch_rrd_lastupdate(rrd_file)
+        # Older rrdtool prints nothing useful; fall back to fetching
+        if "error" in data or not data["timestamps"]:
+            data = None
+    if data is None:
+        data = fetch_rrd_tail(rrd_file)
 
     if "error" in data:
         return data
@@ -5,12 +5,19 @@ enabling natural language queries about device status, network traffic,
 sensor readings, alerts, and historical trends.
 """
 
-import os
+import asyncio
+import functools
+import importlib
 import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Optional
 
-from dotenv import load_dotenv
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import (
@@ -23,19 +30,119 @@ from mcp.types import (
     GetPromptResult,
 )
 
-from .tools.devices import list_devices, get_device
-from .tools.ports import list_ports, get_port_traffic
-from .tools.sensors import list_sensors, get_sensor_classes
-from .tools.alerts import list_alerts, get_alert_summary
-from .tools.trends import get_trends, list_available_metrics
+try:
+    import orjson
+except ImportError:  # Optional; the stdlib encoder produces the same text
+    orjson = None
+
+try:
+    import jsonschema
+except ImportError:  # Older MCP SDKs don't depend on it (nor validate input)
+    jsonschema = None
+
+try:
+    import prometheus_client
+except ImportError:  # Optional; metrics are only exported when installed
+    prometheus_client = None
+
+from .cache import TTLCache
 
 # Load environment variables from .env file
 # Use explicit path since working directory may vary when run via MCP
 _env_path = Path(__file__).parent.parent.parent / ".env"
-load_dotenv(_env_path)
-
-# Server instructions that help LLMs understand the service
+if not os.environ.get("OBSERVIUM_MCP_ENV_LOADED"):
+    # python-dotenv is only imported when there is a file for it to read
+    if _env_path.is_file():
+        from dotenv import load_dotenv
+        load_dotenv(_env_path)
+    os.environ["OBSERVIUM_MCP_ENV_LOADED"] = "1"
+
+
+@functools.lru_cache(maxsize=None)
+def _tool(module: str, name: str) -> Callable[..., Any]:
+    """Import observium_mcp.tools.<module> on first use and return its function."""
+    return getattr(importlib.import_module(f".tools.{module}", __package__), name)
+
+
+def _lazy(module: str, name: str) -> Callable[..., Any]:
+    """Stand-in for a tool function that defers importing its module until called."""
+    def call(*args, **kwargs):
+        return _tool(module, name)(*args, **kwargs)
+    call.__name__ = name
+    return call
+
+
+# The tool modules pull in PyMySQL and the RRD layer; importing them lazily
+# keeps startup down to MCP itself so the server answers initialize sooner
+list_devices = _lazy("devices", "list_devices")
+get_device = _lazy("devices", "get_device")
+list_ports = _lazy("ports", "list_ports")
+get_port_traffic = _lazy("ports", "get_port_traffic")
+get_ports_traffic = _lazy("ports", "get_ports_traffic")
+list_sensors = _lazy("sensors", "list_sensors")
+get_sensor_classes = _lazy("sensors", "get_sensor_classes")
+list_alerts = _lazy("alerts", "list_alerts")
+get_alert_summary = _lazy("alerts", "get_alert_summary")
+get_trends = _lazy("trends", "get_trends")
+list_available_metrics = _lazy("trends", "list_available_metrics")
+
+
+def _dumps(result: Any) -> str:
+    """
+    Serialize a tool or resource result as compact JSON.
+
+    Responses are read by the model, not by people, so they aren't indented;
+    indent= forces the stdlib's pure-Python encoder and makes the payload
+    about a quarter larger.
+    Uses orjson when installed. Tools already stringify their datetimes, so
+    `default=str` only sees the odd Decimal.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            result,
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+        ).decode()
+    return json.dumps(result, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+# Parses our own output back (batch_execute unwraps error results)
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+# Tool and resource handlers block on MySQL and rrdtool; they run here so the
+# event loop keeps serving other requests. Threads persist across calls.
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="observium-tool")
+# Independent lookups inside one tool call. Kept apart from _executor so a
+# tool waiting on its sub-queries can never starve them of workers.
+_fanout_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="observium-fanout")
+
+
+def _submit(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> asyncio.Future:
+    """Schedule a blocking call on the worker pool and return its future."""
+    loop = asyncio.get_running_loop()
+    return loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+
+
+async def _run(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking call on the worker pool without blocking the event loop."""
+    return await _submit(fn, *args, **kwargs)
+
+
+# Server instructions sent once at initialization; kept short, with the full
+# guide available as the observium://server/instructions resource
 SERVER_INSTRUCTIONS = """
+Observium MCP provides read-only access to data from Observium CE (Community Edition)
+network monitoring: devices, ports and traffic, sensors, alerts, and RRD trend history.
+
+Start with get_observium_capabilities or list_devices to discover hostnames and
+device_ids, and list_ports for port_ids. Tool descriptions are brief: call
+get_tool_docs for a tool's full return fields and examples, and read the
+observium://server/instructions resource for common workflows.
+"""
+
+# Longer guide to the service, served as the observium://server/instructions resource
+SERVER_GUIDE = """
 Observium MCP provides access to network monitoring data from Observium CE (Community Edition).
 
 WHAT IS OBSERVIUM:
@@ -52,7 +159,7 @@ DATA AVAILABLE:
 
 COMMON WORKFLOWS:
 1. Device Health Check: list_devices → get_device → list_sensors
-2. Traffic Analysis: list_ports → get_port_traffic (use period for history)
+2. Traffic Analysis: list_ports → get_port_traffic / get_ports_traffic (use period for history)
 3. Troubleshooting: list_alerts → get_device → list_sensors → get_trends
 4. Capacity Planning: get_port_traffic or get_trends with period="1w" or "1m"
 5. Discovery: get_observium_capabilities to see what's monitored
@@ -79,13 +186,10 @@ TIPS FOR BEST RESULTS:
 server = Server("observium-mcp")
 
 
-@server.list_tools()
-async def handle_list_tools() -> list[Tool]:
-    """Return the list of available tools."""
-    return [
-        Tool(
-            name="get_observium_capabilities",
-            description="""Discover what data is available in this Observium instance.
+# Full documentation for each tool, served on demand by get_tool_docs. Tool
+# descriptions are resent with every list_tools result, so they stay one line.
+_TOOL_DOCS: dict[str, str] = {
+    "get_observium_capabilities": """Discover what data is available in this Observium instance.
 
 CALL THIS FIRST to understand what devices, sensors, and metrics exist before
 making specific queries. Returns summary counts and available data types.
@@ -103,14 +207,7 @@ EXAMPLE QUESTIONS:
 - "How many devices are being tracked?"
 - "What types of sensors are available?"
 """,
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        Tool(
-            name="list_devices",
-            description="""List all devices monitored by Observium with their current status.
+    "list_devices": """List all devices monitored by Observium with their current status.
 
 Returns hostname, IP, OS, hardware model, uptime, and polling status for each device.
 Use this to discover what devices exist before drilling down with other tools.
@@ -132,24 +229,7 @@ EXAMPLE QUESTIONS:
 
 NEXT STEPS: Use device_id or hostname with get_device, list_ports, list_sensors, get_trends
 """,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "status_filter": {
-                        "type": "string",
-                        "description": "Filter by device status",
-                        "enum": ["up", "down", "disabled"]
-                    },
-                    "os_filter": {
-                        "type": "string",
-                        "description": "Filter by OS type (examples: 'linux', 'ios', 'junos', 'dlink', 'unifi')"
-                    }
-                }
-            }
-        ),
-        Tool(
-            name="get_device",
-            description="""Get detailed information about a specific device.
+    "get_device": """Get detailed information about a specific device.
 
 Returns comprehensive device details including hardware specs, software version,
 location, uptime, and counts of associated ports, sensors, and alerts.
@@ -171,23 +251,7 @@ EXAMPLE QUESTIONS:
 
 NEXT STEPS: Use list_ports, list_sensors, or list_alerts with this device
 """,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "device_id": {
-                        "type": "integer",
-                        "description": "The device ID (get from list_devices)"
-                    },
-                    "hostname": {
-                        "type": "string",
-                        "description": "The hostname or IP (e.g., 'firewall.local', '192.168.1.1')"
-                    }
-                }
-            }
-        ),
-        Tool(
-            name="list_ports",
-            description="""List network ports/interfaces for a device.
+    "list_ports": """List network ports/interfaces for a device.
 
 Returns all network interfaces with their operational state, speed, and basic
 traffic counters. Essential for finding port_ids before querying traffic details.
@@ -209,35 +273,10 @@ EXAMPLE QUESTIONS:
 - "Which ports have errors?"
 - "List ports that are admin up but operationally down"
 
-NEXT STEPS: Use port_id with get_port_traffic for detailed bandwidth analysis
+NEXT STEPS: Use port_id with get_port_traffic, or several with get_ports_traffic, for
+detailed bandwidth analysis
 """,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "device_id": {
-                        "type": "integer",
-                        "description": "The device ID (get from list_devices)"
-                    },
-                    "hostname": {
-                        "type": "string",
-                        "description": "The hostname or IP address"
-                    },
-                    "admin_status": {
-                        "type": "string",
-                        "description": "Filter by administrative status",
-                        "enum": ["up", "down"]
-                    },
-                    "oper_status": {
-                        "type": "string",
-                        "description": "Filter by operational status",
-                        "enum": ["up", "down"]
-                    }
-                }
-            }
-        ),
-        Tool(
-            name="get_port_traffic",
-            description="""Get detailed traffic statistics for a specific network port.
+    "get_port_traffic": """Get detailed traffic statistics for a specific network port.
 
 Returns current bandwidth rates and historical statistics including peak and
 average utilization. Essential for capacity planning and troubleshooting.
@@ -264,33 +303,24 @@ EXAMPLE QUESTIONS:
 
 TIP: Use list_ports first to find the port_id, or specify device_hostname + port_name
 """,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "port_id": {
-                        "type": "integer",
-                        "description": "The port ID (get from list_ports)"
-                    },
-                    "device_hostname": {
-                        "type": "string",
-                        "description": "Device hostname (use with port_name if port_id unknown)"
-                    },
-                    "port_name": {
-                        "type": "string",
-                        "description": "Port name like 'GE0/0/1', 'eth0', or description like 'Internet'"
-                    },
-                    "period": {
-                        "type": "string",
-                        "description": "Time period for historical statistics",
-                        "enum": ["1h", "6h", "1d", "1w", "1m"],
-                        "default": "1d"
-                    }
-                }
-            }
-        ),
-        Tool(
-            name="list_sensors",
-            description="""List sensors (temperature, voltage, frequency, etc.) across devices.
+    "get_ports_traffic": """Get traffic statistics for several ports in one call.
+
+Same per-port result as get_port_traffic, for up to 50 port_ids. The ports are
+read in one query and their RRD files are fetched concurrently, so this is
+much faster than one get_port_traffic call per port.
+
+RETURNS: Array with one get_port_traffic result per port_id, in the order
+given; unknown ports appear as {"error": "Port not found: <id>"}
+
+PERIODS: 1h (hour), 6h (6 hours), 1d (day), 1w (week), 1m (month)
+
+EXAMPLE QUESTIONS:
+- "Compare utilization of all uplinks on the core switch this week"
+- "Which of these ports peaked above 80% today?"
+
+TIP: Use list_ports to find the port_ids, e.g. with oper_status="up"
+""",
+    "list_sensors": """List sensors (temperature, voltage, frequency, etc.) across devices.
 
 Returns current sensor readings with status relative to configured thresholds.
 Sensors are auto-discovered via SNMP from devices that support environmental monitoring.
@@ -301,7 +331,7 @@ RETURNS: Array of sensors with:
 - sensor_class: Type (temperature, voltage, frequency, fanspeed, power, humidity)
 - sensor_descr: Sensor name/description
 - value: Current reading with unit
-- status: normal, warning, or critical (based on thresholds)
+- status: normal, warning_high/low, or critical_high/low (based on thresholds)
 - limits: Configured thresholds (critical_high, warning_high, warning_low, critical_low)
 
 SENSOR CLASSES:
@@ -318,30 +348,10 @@ EXAMPLE QUESTIONS:
 - "Are any sensors in warning or critical state?"
 - "What's the CPU temperature on the server?"
 
-TIP: Filter by sensor_class to focus on specific sensor types
+TIP: Filter by sensor_class to focus on specific sensor types, and use
+status_filter=["warning", "critical"] to get only sensors out of range
 """,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "device_id": {
-                        "type": "integer",
-                        "description": "Filter by device ID"
-                    },
-                    "hostname": {
-                        "type": "string",
-                        "description": "Filter by device hostname"
-                    },
-                    "sensor_class": {
-                        "type": "string",
-                        "description": "Filter by sensor type",
-                        "enum": ["temperature", "voltage", "frequency", "fanspeed", "power", "humidity", "current", "dbm", "load", "state"]
-                    }
-                }
-            }
-        ),
-        Tool(
-            name="list_alerts",
-            description="""List alerts from Observium with status and details.
+    "list_alerts": """List alerts from Observium with status and details.
 
 Returns active or historical alerts including device down, port down, and
 sensor threshold violations. Use for troubleshooting and monitoring.
@@ -367,36 +377,12 @@ EXAMPLE QUESTIONS:
 - "Show me all recovered alerts"
 - "What's alerting on the switch?"
 
+PAGING: For long histories, page with before_ts/before_id set to the
+last_changed_unix/alert_id of the previous page's last alert instead of offset.
+
 NEXT STEPS: Use get_alert_summary for overview, or investigate with get_device/list_sensors
 """,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "device_id": {
-                        "type": "integer",
-                        "description": "Filter by device ID"
-                    },
-                    "hostname": {
-                        "type": "string",
-                        "description": "Filter by device hostname"
-                    },
-                    "status": {
-                        "type": "string",
-                        "description": "Filter by alert status",
-                        "enum": ["active", "recovered", "all"],
-                        "default": "active"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum alerts to return (default: 50, max: 500)",
-                        "default": 50
-                    }
-                }
-            }
-        ),
-        Tool(
-            name="get_alert_summary",
-            description="""Get a summary of current alert status.
+    "get_alert_summary": """Get a summary of current alert status.
 
 Returns aggregated alert counts by type, entity, and device. Use for quick
 health overview before drilling into specific alerts.
@@ -416,14 +402,7 @@ EXAMPLE QUESTIONS:
 
 NEXT STEPS: Use list_alerts for details on specific alerts
 """,
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        Tool(
-            name="get_trends",
-            description="""Get historical trend data for device metrics.
+    "get_trends": """Get historical trend data for device metrics.
 
 Returns time-series data for CPU, memory, load, or uptime with statistics.
 Data comes from RRD files updated every 5 minutes by Observium polling.
@@ -433,7 +412,8 @@ RETURNS:
 - datasources: What values are in the data (e.g., load1, load5, load15)
 - data_points: Number of samples
 - statistics: For each datasource - min, max, avg, current
-- data: Array of timestamped values (last 100 points)
+- data: timestamps plus one value list per datasource (series), aligned by
+  index; long periods are thinned evenly to max_points samples (default 100)
 
 METRICS:
 - load: System load average (load1, load5, load15)
@@ -451,36 +431,7 @@ EXAMPLE QUESTIONS:
 
 TIP: Use list_available_metrics first to see what data exists for a device
 """,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "device_id": {
-                        "type": "integer",
-                        "description": "The device ID"
-                    },
-                    "hostname": {
-                        "type": "string",
-                        "description": "The device hostname"
-                    },
-                    "metric": {
-                        "type": "string",
-                        "description": "Type of metric to retrieve",
-                        "enum": ["load", "cpu", "memory", "uptime"],
-                        "default": "load"
-                    },
-                    "period": {
-                        "type": "string",
-                        "description": "Time period for historical data",
-                        "enum": ["1h", "6h", "1d", "1w", "1m"],
-                        "default": "1d"
-                    }
-                },
-                "required": ["hostname"]
-            }
-        ),
-        Tool(
-            name="list_available_metrics",
-            description="""List available metrics (RRD files) for a device.
+    "list_available_metrics": """List available metrics (RRD files) for a device.
 
 Shows what historical trend data can be queried for a specific device.
 RRD files are created automatically based on what Observium discovers via SNMP.
@@ -501,154 +452,631 @@ EXAMPLE QUESTIONS:
 
 NEXT STEPS: Use get_trends with discovered metrics, or get_port_traffic for network data
 """,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "device_id": {
-                        "type": "integer",
-                        "description": "The device ID"
-                    },
-                    "hostname": {
+    "batch_execute": """Run several of the other tools in one call.
+
+Use this when you already know the next few lookups you need (for example
+get_device, list_sensors and get_trends for the same host): they run
+concurrently and come back together, saving a round trip per call.
+
+RETURNS: One entry per operation, in order, with index, tool, ok, and either
+result (the tool's normal output) or error.
+""",
+}
+
+
+def get_tool_docs(tool_name: str) -> dict[str, Any]:
+    """Return the full documentation for a tool."""
+    docs = _TOOL_DOCS.get(tool_name)
+    if docs is None:
+        return {"error": f"Unknown tool: {tool_name}"}
+    return {"tool": tool_name, "documentation": docs}
+
+
+# Default page size for the list_* tools; results are cut to what the model reads
+_DEFAULT_PAGE_SIZE = 200
+
+
+def _page_properties(noun: str) -> dict[str, Any]:
+    """Schema properties for paging and trimming a list_* tool's results."""
+    return {
+        "limit": {
+            "type": "integer",
+            "description": f"Maximum {noun} to return (default: {_DEFAULT_PAGE_SIZE})",
+            "minimum": 1,
+            "maximum": 1000,
+            "default": _DEFAULT_PAGE_SIZE
+        },
+        "offset": {
+            "type": "integer",
+            "description": f"Number of {noun} to skip; page with offset=limit, 2*limit, ...",
+            "minimum": 0,
+            "default": 0
+        },
+        "fields": {
+            "type": "array",
+            "description": f"Only return these fields of each of the {noun} (default: all)",
+            "items": {"type": "string"}
+        },
+    }
+
+
+# Tool definitions never change; build them once instead of on every list_tools request
+_TOOLS: list[Tool] = [
+    Tool(
+        name="get_observium_capabilities",
+        description=(
+            "CALL THIS FIRST: what this Observium instance monitors - device counts by OS and "
+            "status, sensor classes, alert counts, trend metrics."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    Tool(
+        name="list_devices",
+        description=(
+            "List monitored devices with device_id, hostname, OS, hardware, uptime, status and "
+            "last poll time."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "status_filter": {
+                    "type": "string",
+                    "description": "Filter by device status",
+                    "enum": ["up", "down", "disabled"]
+                },
+                "os_filter": {
+                    "type": "string",
+                    "description": (
+                        "Filter by OS type (examples: 'linux', 'ios', 'junos', 'dlink', 'unifi')"
+                    )
+                },
+                **_page_properties("devices")
+            }
+        }
+    ),
+    Tool(
+        name="get_device",
+        description=(
+            "Details for one device: hardware, OS version, serial, location, uptime, and its port, "
+            "sensor and active alert counts."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "device_id": {
+                    "type": "integer",
+                    "description": "The device ID (get from list_devices)"
+                },
+                "hostname": {
+                    "type": "string",
+                    "description": "The hostname or IP (e.g., 'firewall.local', '192.168.1.1')"
+                }
+            }
+        }
+    ),
+    Tool(
+        name="list_ports",
+        description=(
+            "List a device's network ports with port_id, name, alias, speed, admin/oper status and "
+            "traffic/error counters."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "device_id": {
+                    "type": "integer",
+                    "description": "The device ID (get from list_devices)"
+                },
+                "hostname": {
+                    "type": "string",
+                    "description": "The hostname or IP address"
+                },
+                "admin_status": {
+                    "type": "string",
+                    "description": "Filter by administrative status",
+                    "enum": ["up", "down"]
+                },
+                "oper_status": {
+                    "type": "string",
+                    "description": "Filter by operational status",
+                    "enum": ["up", "down"]
+                },
+                **_page_properties("ports")
+            }
+        }
+    ),
+    Tool(
+        name="get_port_traffic",
+        description=(
+            "Current bandwidth and peak/average utilization over a period for one port (by "
+            "port_id, or device_hostname + port_name)."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "port_id": {
+                    "type": "integer",
+                    "description": "The port ID (get from list_ports)"
+                },
+                "device_hostname": {
+                    "type": "string",
+                    "description": "Device hostname (use with port_name if port_id unknown)"
+                },
+                "port_name": {
+                    "type": "string",
+                    "description": (
+                        "Port name like 'GE0/0/1', 'eth0', or description like 'Internet'"
+                    )
+                },
+                "period": {
+                    "type": "string",
+                    "description": "Time period for historical statistics",
+                    "enum": ["1h", "6h", "1d", "1w", "1m"],
+                    "default": "1d"
+                }
+            }
+        }
+    ),
+    Tool(
+        name="get_ports_traffic",
+        description=(
+            "get_port_traffic for up to 50 ports at once (by port_ids), fetched concurrently; use "
+            "to compare or report on several ports."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "port_ids": {
+                    "type": "array",
+                    "description": "The port IDs (get from list_ports)",
+                    "items": {"type": "integer"},
+                    "minItems": 1,
+                    "maxItems": 50
+                },
+                "period": {
+                    "type": "string",
+                    "description": "Time period for historical statistics",
+                    "enum": ["1h", "6h", "1d", "1w", "1m"],
+                    "default": "1d"
+                }
+            },
+            "required": ["port_ids"]
+        }
+    ),
+    Tool(
+        name="list_sensors",
+        description=(
+            "List sensor readings (temperature, voltage, fanspeed, ...) with threshold status; "
+            "filter by device, sensor_class or status."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "device_id": {
+                    "type": "integer",
+                    "description": "Filter by device ID"
+                },
+                "hostname": {
+                    "type": "string",
+                    "description": "Filter by device hostname"
+                },
+                "sensor_class": {
+                    "type": "string",
+                    "description": "Filter by sensor type",
+                    "enum": [
+                        "temperature", "voltage", "frequency", "fanspeed", "power",
+                        "humidity", "current", "dbm", "load", "state",
+                    ]
+                },
+                "status_filter": {
+                    "type": "array",
+                    "description": (
+                        "Only return sensors in these states; 'warning' and 'critical' match both "
+                        "the high and low variants"
+                    ),
+                    "items": {
                         "type": "string",
-                        "description": "The device hostname"
+                        "enum": [
+                            "normal", "warning", "critical", "warning_high", "warning_low",
+                            "critical_high", "critical_low",
+                        ]
                     }
-                }
+                },
+                **_page_properties("sensors")
             }
+        }
+    ),
+    Tool(
+        name="list_alerts",
+        description=(
+            "List active, recovered or all alerts for devices, ports and sensors, with the "
+            "affected entity and duration."
         ),
-    ]
-
-
-@server.list_resources()
-async def handle_list_resources() -> list[Resource]:
-    """Return browsable resources."""
-    return [
-        Resource(
-            uri="observium://devices",
-            name="All Monitored Devices",
-            description="Complete list of devices monitored by Observium with current status, OS, and uptime",
-            mimeType="application/json"
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "device_id": {
+                    "type": "integer",
+                    "description": "Filter by device ID"
+                },
+                "hostname": {
+                    "type": "string",
+                    "description": "Filter by device hostname"
+                },
+                "status": {
+                    "type": "string",
+                    "description": "Filter by alert status",
+                    "enum": ["active", "recovered", "all"],
+                    "default": "active"
+                },
+                **_page_properties("alerts"),
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum alerts to return (default: 50, max: 500)",
+                    "minimum": 1,
+                    "maximum": 500,
+                    "default": 50
+                },
+                "before_ts": {
+                    "type": "integer",
+                    "description": (
+                        "Only alerts that last changed before this Unix time; for the next page "
+                        "pass the last alert's last_changed_unix (faster than offset on long "
+                        "histories)"
+                    )
+                },
+                "before_id": {
+                    "type": "integer",
+                    "description": (
+                        "With before_ts, the last alert's alert_id, so alerts with the same "
+                        "timestamp are not skipped"
+                    )
+                }
+            }
+        }
+    ),
+    Tool(
+        name="get_alert_summary",
+        description=(
+            "Alert counts by status, entity type and device, plus the latest alerts: a quick "
+            "health overview."
         ),
-        Resource(
-            uri="observium://devices/down",
-            name="Down Devices",
-            description="Devices currently in 'down' status requiring attention",
-            mimeType="application/json"
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    Tool(
+        name="get_trends",
+        description=(
+            "Historical min/max/avg/current and samples for a device's load, cpu, memory or uptime "
+            "over 1h to 1m."
         ),
-        Resource(
-            uri="observium://alerts/active",
-            name="Active Alerts",
-            description="Currently active alerts that have not been recovered",
-            mimeType="application/json"
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "device_id": {
+                    "type": "integer",
+                    "description": "The device ID"
+                },
+                "hostname": {
+                    "type": "string",
+                    "description": "The device hostname"
+                },
+                "metric": {
+                    "type": "string",
+                    "description": "Type of metric to retrieve",
+                    "enum": ["load", "cpu", "memory", "uptime"],
+                    "default": "load"
+                },
+                "period": {
+                    "type": "string",
+                    "description": "Time period for historical data",
+                    "enum": ["1h", "6h", "1d", "1w", "1m"],
+                    "default": "1d"
+                },
+                "max_points": {
+                    "type": "integer",
+                    "description": (
+                        "Maximum samples to return, spread evenly over the period (default: 100)"
+                    ),
+                    "minimum": 1,
+                    "maximum": 1000,
+                    "default": 100
+                }
+            },
+            "required": ["hostname"]
+        }
+    ),
+    Tool(
+        name="list_available_metrics",
+        description=(
+            "List the RRD metrics (system, network, sensors, performance) that can be queried for "
+            "a device."
         ),
-        Resource(
-            uri="observium://alerts/summary",
-            name="Alert Summary",
-            description="Overview of alert counts by type and device",
-            mimeType="application/json"
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "device_id": {
+                    "type": "integer",
+                    "description": "The device ID"
+                },
+                "hostname": {
+                    "type": "string",
+                    "description": "The device hostname"
+                }
+            }
+        }
+    ),
+    Tool(
+        name="get_tool_docs",
+        description=(
+            "Full documentation for one of these tools: every returned field, example questions "
+            "and follow-up tips."
         ),
-        Resource(
-            uri="observium://sensors/temperature",
-            name="Temperature Sensors",
-            description="All temperature sensor readings across all devices",
-            mimeType="application/json"
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "tool_name": {
+                    "type": "string",
+                    "description": "Name of the tool to describe",
+                    "enum": list(_TOOL_DOCS)
+                }
+            },
+            "required": ["tool_name"]
+        }
+    ),
+]
+
+# Every tool above only reads from Observium, so any of them may be batched
+_BATCHABLE_TOOLS = [tool.name for tool in _TOOLS]
+
+_TOOLS.append(
+    Tool(
+        name="batch_execute",
+        description=(
+            "Run several of the other tools concurrently in one call; returns one result or error "
+            "per operation, in order."
         ),
-        Resource(
-            uri="observium://sensors/critical",
-            name="Critical Sensors",
-            description="Sensors currently in warning or critical state",
-            mimeType="application/json"
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "operations": {
+                    "type": "array",
+                    "description": "Tool calls to run",
+                    "minItems": 1,
+                    "maxItems": 20,
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "tool": {
+                                "type": "string",
+                                "enum": _BATCHABLE_TOOLS,
+                                "description": "Name of the tool to call"
+                            },
+                            "arguments": {
+                                "type": "object",
+                                "description": "Arguments for that tool",
+                                "default": {}
+                            }
+                        },
+                        "required": ["tool"]
+                    }
+                },
+                "max_concurrent": {
+                    "type": "integer",
+                    "description": "Maximum operations running at once (default: 4)",
+                    "minimum": 1,
+                    "maximum": 16,
+                    "default": 4
+                },
+                "stop_on_error": {
+                    "type": "boolean",
+                    "description": (
+                        "Skip operations not yet started once one fails (default: false)"
+                    ),
+                    "default": False
+                }
+            },
+            "required": ["operations"]
+        }
+    )
+)
+
+
+@server.list_tools()
+async def handle_list_tools() -> list[Tool]:
+    """Return the list of available tools."""
+    return _TOOLS
+
+
+# Resource and prompt listings are static too; built once like _TOOLS
+_RESOURCES: list[Resource] = [
+    Resource(
+        uri="observium://server/instructions",
+        name="Server Guide",
+        description="What this server exposes, common tool workflows, and tips for querying it",
+        mimeType="application/json"
+    ),
+    Resource(
+        uri="observium://devices",
+        name="All Monitored Devices",
+        description=(
+            "Complete list of devices monitored by Observium with current status, OS, and uptime"
         ),
-    ]
+        mimeType="application/json"
+    ),
+    Resource(
+        uri="observium://devices/down",
+        name="Down Devices",
+        description="Devices currently in 'down' status requiring attention",
+        mimeType="application/json"
+    ),
+    Resource(
+        uri="observium://alerts/active",
+        name="Active Alerts",
+        description="Currently active alerts that have not been recovered",
+        mimeType="application/json"
+    ),
+    Resource(
+        uri="observium://alerts/summary",
+        name="Alert Summary",
+        description="Overview of alert counts by type and device",
+        mimeType="application/json"
+    ),
+    Resource(
+        uri="observium://sensors/temperature",
+        name="Temperature Sensors",
+        description="All temperature sensor readings across all devices",
+        mimeType="application/json"
+    ),
+    Resource(
+        uri="observium://sensors/critical",
+        name="Critical Sensors",
+        description="Sensors currently in warning or critical state",
+        mimeType="application/json"
+    ),
+]
+
+
+@server.list_resources()
+async def handle_list_resources() -> list[Resource]:
+    """Return browsable resources."""
+    return _RESOURCES
 
 
 @server.read_resource()
-async def handle_read_resource(uri: str) -> str:
+async def handle_read_resource(uri: Any) -> str:
     """Handle resource reads."""
-    result = None
-
-    if uri == "observium://devices":
-        result = list_devices()
-    elif uri == "observium://devices/down":
-        result = list_devices(status_filter="down")
-    elif uri == "observium://alerts/active":
-        result = list_alerts(status="active", limit=100)
-    elif uri == "observium://alerts/summary":
-        result = get_alert_summary()
-    elif uri == "observium://sensors/temperature":
-        result = list_sensors(sensor_class="temperature")
-    elif uri == "observium://sensors/critical":
-        # Get all sensors and filter for warning/critical
-        all_sensors = list_sensors()
-        result = [s for s in all_sensors if s.get("status") in ("warning", "critical")]
-    else:
-        result = {"error": f"Unknown resource: {uri}"}
-
-    return json.dumps(result, indent=2, default=str)
+    # The SDK passes a pydantic AnyUrl, which never compares equal to a str
+    return await _run(_read_resource, str(uri))
+
+
+# Serialized resource bodies, reused for OBSERVIUM_RESOURCE_TTL seconds
+_resource_cache = TTLCache(maxsize=32)
+
+
+@functools.lru_cache(maxsize=1)
+def _resource_ttl() -> float:
+    """Get the resource cache TTL (0 means no caching)."""
+    return float(os.getenv("OBSERVIUM_RESOURCE_TTL", "30"))
+
+
+def _read_resource(uri: str) -> str:
+    """Read a resource, reusing a recent serialization (runs in the worker pool)."""
+    ttl = _resource_ttl()
+    if ttl > 0:
+        text = _resource_cache.get(uri)
+        if text is not None:
+            return text
+
+    result = _fetch_resource(uri)
+    text = _dumps(result)
+    if ttl > 0 and not (isinstance(result, dict) and "error" in result):
+        _resource_cache.set(uri, text, ttl)
+    return text
+
+
+# Resource URI -> zero-argument function producing its data
+_RESOURCE_HANDLERS: dict[str, Callable[[], Any]] = {
+    "observium://server/instructions": lambda: {"instructions": SERVER_GUIDE},
+    "observium://devices": functools.partial(list_devices, limit=500),
+    "observium://devices/down": functools.partial(list_devices, status_filter="down"),
+    "observium://alerts/active": functools.partial(list_alerts, status="active", limit=100),
+    "observium://alerts/summary": get_alert_summary,
+    "observium://sensors/temperature": functools.partial(
+        list_sensors, sensor_class="temperature", limit=200
+    ),
+    "observium://sensors/critical": functools.partial(
+        list_sensors, status_filter=["warning", "critical"]
+    ),
+}
+
+
+def _fetch_resource(uri: str) -> Any:
+    """Fetch the data behind a resource URI."""
+    handler = _RESOURCE_HANDLERS.get(uri)
+    if handler is None:
+        return {"error": f"Unknown resource: {uri}"}
+    return handler()
+
+
+_PROMPTS: list[Prompt] = [
+    Prompt(
+        name="network_health_check",
+        description=(
+            "Comprehensive network health check: device status, active alerts, and critical sensors"
+        ),
+        arguments=[]
+    ),
+    Prompt(
+        name="device_troubleshooting",
+        description=(
+            "Diagnose issues with a specific device: status, alerts, sensors, and recent trends"
+        ),
+        arguments=[
+            PromptArgument(
+                name="hostname",
+                description="Device hostname or IP to troubleshoot",
+                required=True
+            )
+        ]
+    ),
+    Prompt(
+        name="capacity_report",
+        description=(
+            "Analyze bandwidth utilization across ports to identify busy or congested links"
+        ),
+        arguments=[
+            PromptArgument(
+                name="hostname",
+                description="Device hostname (optional - all devices if not specified)",
+                required=False
+            ),
+            PromptArgument(
+                name="period",
+                description="Analysis period: 1d, 1w, or 1m (default: 1w)",
+                required=False
+            )
+        ]
+    ),
+    Prompt(
+        name="temperature_audit",
+        description=(
+            "Review all temperature sensors and identify any running hot or in warning state"
+        ),
+        arguments=[]
+    ),
+    Prompt(
+        name="alert_investigation",
+        description="Investigate current alerts and provide recommended actions",
+        arguments=[]
+    ),
+]
 
 
 @server.list_prompts()
 async def handle_list_prompts() -> list[Prompt]:
     """Return available prompt templates."""
-    return [
-        Prompt(
-            name="network_health_check",
-            description="Comprehensive network health check: device status, active alerts, and critical sensors",
-            arguments=[]
-        ),
-        Prompt(
-            name="device_troubleshooting",
-            description="Diagnose issues with a specific device: status, alerts, sensors, and recent trends",
-            arguments=[
-                PromptArgument(
-                    name="hostname",
-                    description="Device hostname or IP to troubleshoot",
-                    required=True
-                )
-            ]
-        ),
-        Prompt(
-            name="capacity_report",
-            description="Analyze bandwidth utilization across ports to identify busy or congested links",
-            arguments=[
-                PromptArgument(
-                    name="hostname",
-                    description="Device hostname (optional - all devices if not specified)",
-                    required=False
-                ),
-                PromptArgument(
-                    name="period",
-                    description="Analysis period: 1d, 1w, or 1m (default: 1w)",
-                    required=False
-                )
-            ]
-        ),
-        Prompt(
-            name="temperature_audit",
-            description="Review all temperature sensors and identify any running hot or in warning state",
-            arguments=[]
-        ),
-        Prompt(
-            name="alert_investigation",
-            description="Investigate current alerts and provide recommended actions",
-            arguments=[]
-        ),
-    ]
+    return _PROMPTS
 
 
-@server.get_prompt()
-async def handle_get_prompt(name: str, arguments: dict | None) -> GetPromptResult:
-    """Handle prompt requests."""
-    args = arguments or {}
+def _prompt_result(description: str, text: str) -> GetPromptResult:
+    """Wrap prompt text as a single user message."""
+    return GetPromptResult(
+        description=description,
+        messages=[PromptMessage(role="user", content=TextContent(type="text", text=text))]
+    )
 
-    if name == "network_health_check":
-        return GetPromptResult(
-            description="Comprehensive network health check",
-            messages=[
-                PromptMessage(
-                    role="user",
-                    content=TextContent(
-                        type="text",
-                        text="""Please perform a comprehensive network health check using the Observium data:
+
+# Prompts without arguments never change; their results are built once
+_STATIC_PROMPTS: dict[str, GetPromptResult] = {
+    "network_health_check": _prompt_result(
+        "Comprehensive network health check",
+        """Please perform a comprehensive network health check using the Observium data:
 
 1. First, use get_observium_capabilities to understand what's being monitored
 2. Check for any devices that are down using list_devices with status_filter="down"
@@ -662,21 +1090,48 @@ Provide a clear summary with:
 - Active alerts requiring attention
 - Any sensors outside normal range
 - Recommended actions if any issues found"""
-                    )
-                )
-            ]
-        )
+    ),
+    "temperature_audit": _prompt_result(
+        "Temperature sensor audit",
+        """Please audit all temperature sensors in Observium:
 
-    elif name == "device_troubleshooting":
-        hostname = args.get("hostname", "")
-        return GetPromptResult(
-            description=f"Troubleshoot device: {hostname}",
-            messages=[
-                PromptMessage(
-                    role="user",
-                    content=TextContent(
-                        type="text",
-                        text=f"""Please troubleshoot the device "{hostname}" using Observium data:
+1. Use list_sensors with sensor_class="temperature" to get all temperature readings
+2. Identify the hottest sensors
+3. Check for any in warning or critical state
+4. Group by device to identify any devices running hot
+
+Provide a temperature report:
+- Total temperature sensors monitored
+- Sensors grouped by device with current readings
+- Hottest sensors (top 5)
+- Any sensors in warning or critical state
+- Devices that may have cooling issues
+- Recommendations if any temperatures are concerning"""
+    ),
+    "alert_investigation": _prompt_result(
+        "Alert investigation and recommendations",
+        """Please investigate current Observium alerts:
+
+1. Use get_alert_summary to get an overview
+2. Use list_alerts with status="active" to get details on active alerts
+3. For each active alert, gather context:
+   - Device alerts: check device status with get_device
+   - Port alerts: check port status with list_ports
+   - Sensor alerts: check sensor readings with list_sensors
+4. Also check recently recovered alerts to understand patterns
+
+Provide an alert investigation report:
+- Summary of active alerts
+- Details on each active alert with context
+- Impact assessment (which services/devices affected)
+- Recommended actions for each alert
+- Any patterns observed (e.g., multiple alerts on same device)
+- Priority order for addressing issues"""
+    ),
+}
+
+_DEVICE_TROUBLESHOOTING_PROMPT = """\
+Please troubleshoot the device "{hostname}" using Observium data:
 
 1. Get device details using get_device with hostname="{hostname}"
 2. Check for any active alerts on this device using list_alerts
@@ -693,28 +1148,12 @@ Provide a diagnostic summary:
 - Port status summary
 - Potential issues identified
 - Recommended actions"""
-                    )
-                )
-            ]
-        )
 
-    elif name == "capacity_report":
-        hostname = args.get("hostname", "")
-        period = args.get("period", "1w")
+_CAPACITY_REPORT_PROMPT = """Please analyze network capacity {device_filter} over the past {period}:
 
-        device_filter = f'for device "{hostname}"' if hostname else "across all devices"
-        return GetPromptResult(
-            description=f"Capacity analysis {device_filter}",
-            messages=[
-                PromptMessage(
-                    role="user",
-                    content=TextContent(
-                        type="text",
-                        text=f"""Please analyze network capacity {device_filter} over the past {period}:
-
-1. {"Use get_device to get details for " + hostname if hostname else "Use list_devices to identify network devices (switches, routers)"}
+1. {first_step}
 2. For each relevant device, use list_ports to find active interfaces
-3. For key ports (uplinks, WAN links), use get_port_traffic with period="{period}"
+3. For key ports (uplinks, WAN links), use one get_ports_traffic call with period="{period}"
 4. Focus on ports with high utilization or significant traffic
 
 Provide a capacity report including:
@@ -724,103 +1163,70 @@ Provide a capacity report including:
 - Any ports approaching capacity (>70% peak)
 - Ports with concerning trends
 - Recommendations for capacity planning"""
-                    )
-                )
-            ]
-        )
 
-    elif name == "temperature_audit":
-        return GetPromptResult(
-            description="Temperature sensor audit",
-            messages=[
-                PromptMessage(
-                    role="user",
-                    content=TextContent(
-                        type="text",
-                        text="""Please audit all temperature sensors in Observium:
 
-1. Use list_sensors with sensor_class="temperature" to get all temperature readings
-2. Identify the hottest sensors
-3. Check for any in warning or critical state
-4. Group by device to identify any devices running hot
+@server.get_prompt()
+async def handle_get_prompt(name: str, arguments: dict | None) -> GetPromptResult:
+    """Handle prompt requests."""
+    static = _STATIC_PROMPTS.get(name)
+    if static is not None:
+        return static
 
-Provide a temperature report:
-- Total temperature sensors monitored
-- Sensors grouped by device with current readings
-- Hottest sensors (top 5)
-- Any sensors in warning or critical state
-- Devices that may have cooling issues
-- Recommendations if any temperatures are concerning"""
-                    )
-                )
-            ]
-        )
+    args = arguments or {}
 
-    elif name == "alert_investigation":
-        return GetPromptResult(
-            description="Alert investigation and recommendations",
-            messages=[
-                PromptMessage(
-                    role="user",
-                    content=TextContent(
-                        type="text",
-                        text="""Please investigate current Observium alerts:
+    if name == "device_troubleshooting":
+        hostname = args.get("hostname", "")
+        return _prompt_result(
+            f"Troubleshoot device: {hostname}",
+            _DEVICE_TROUBLESHOOTING_PROMPT.format(hostname=hostname)
+        )
 
-1. Use get_alert_summary to get an overview
-2. Use list_alerts with status="active" to get details on active alerts
-3. For each active alert, gather context:
-   - Device alerts: check device status with get_device
-   - Port alerts: check port status with list_ports
-   - Sensor alerts: check sensor readings with list_sensors
-4. Also check recently recovered alerts to understand patterns
+    elif name == "capacity_report":
+        hostname = args.get("hostname", "")
+        period = args.get("period", "1w")
 
-Provide an alert investigation report:
-- Summary of active alerts
-- Details on each active alert with context
-- Impact assessment (which services/devices affected)
-- Recommended actions for each alert
-- Any patterns observed (e.g., multiple alerts on same device)
-- Priority order for addressing issues"""
-                    )
-                )
-            ]
+        device_filter = f'for device "{hostname}"' if hostname else "across all devices"
+        if hostname:
+            first_step = f"Use get_device to get details for {hostname}"
+        else:
+            first_step = "Use list_devices to identify network devices (switches, routers)"
+        return _prompt_result(
+            f"Capacity analysis {device_filter}",
+            _CAPACITY_REPORT_PROMPT.format(
+                device_filter=device_filter, period=period, first_step=first_step
+            )
         )
 
     else:
-        return GetPromptResult(
-            description="Unknown prompt",
-            messages=[
-                PromptMessage(
-                    role="user",
-                    content=TextContent(
-                        type="text",
-                        text=f"Unknown prompt: {name}"
-                    )
-                )
-            ]
-        )
+        return _prompt_result("Unknown prompt", f"Unknown prompt: {name}")
 
 
-def get_observium_capabilities() -> dict:
-    """Get a summary of what's available in this Observium instance."""
-    # Get device summary
-    all_devices = list_devices()
-    devices_by_os = {}
-    devices_by_status = {"up": 0, "down": 0, "disabled": 0}
+def _gather(*calls: Callable[[], Any]) -> list[Any]:
+    """
+    Run independent blocking calls concurrently and return their results in order.
 
-    for device in all_devices:
-        os_name = device.get("os", "unknown")
-        devices_by_os[os_name] = devices_by_os.get(os_name, 0) + 1
+    The first call runs on the calling thread, which would otherwise sit idle
+    waiting; the rest go to the fan-out pool. Exceptions propagate.
+    """
+    futures = [_fanout_executor.submit(call) for call in calls[1:]]
+    first = calls[0]()
+    return [first, *(future.result() for future in futures)]
 
-        status = device.get("status", "unknown")
-        if status in devices_by_status:
-            devices_by_status[status] += 1
 
-    # Get sensor classes
-    sensor_classes = get_sensor_classes()
+def get_observium_capabilities() -> dict:
+    """Get a summary of what's available in this Observium instance."""
+    # The three lookups are independent; overlap their database round trips.
+    # Only os and status are counted, so only those columns are fetched.
+    all_devices, sensor_classes, alert_summary = _gather(
+        functools.partial(list_devices, fields=["os", "status"]),
+        get_sensor_classes,
+        get_alert_summary,
+    )
 
-    # Get alert summary
-    alert_summary = get_alert_summary()
+    # Get device summary
+    devices_by_os = dict(Counter(device.get("os", "unknown") for device in all_devices))
+    status_counts = Counter(device.get("status", "unknown") for device in all_devices)
+    devices_by_status = {status: status_counts[status] for status in ("up", "down", "disabled")}
 
     return {
         "description": "Observium CE Network Monitoring System",
@@ -845,91 +1251,481 @@ def get_observium_capabilities() -> dict:
     }
 
 
-@server.call_tool()
+def _compile_validators() -> dict[str, Any]:
+    """Build one reusable JSON Schema validator per tool from _TOOLS."""
+    if jsonschema is None:
+        return {}
+    validators = {}
+    for tool in _TOOLS:
+        cls = jsonschema.validators.validator_for(tool.inputSchema)
+        cls.check_schema(tool.inputSchema)
+        validators[tool.name] = cls(tool.inputSchema)
+    return validators
+
+
+# The SDK's own check calls jsonschema.validate(), which re-checks the schema
+# and builds a validator on every call (~2.5ms); a prebuilt one takes ~20us
+_VALIDATORS = _compile_validators()
+
+try:
+    _call_tool_handler = server.call_tool(validate_input=False)
+except TypeError:  # SDK without built-in input validation
+    _call_tool_handler = server.call_tool()
+
+
+@_call_tool_handler
 async def handle_call_tool(name: str, arguments: dict) -> list[TextContent]:
     """Handle tool calls."""
-    result = None
+    handler = _LOOP_TOOLS.get(name)
+    if handler is not None:
+        text = await handler(arguments)
+    else:
+        text, _ = await _execute(name, arguments)
+    return [TextContent(type="text", text=text)]
+
+
+def _validate(name: str, arguments: dict) -> Optional[dict]:
+    """Check arguments against the tool's input schema; return an error result if invalid."""
+    validator = _VALIDATORS.get(name)
+    if validator is not None:
+        try:
+            validator.validate(arguments)
+        except jsonschema.ValidationError as e:
+            return {"error": f"Invalid arguments for {name}: {e.message}"}
+    return None
+
+
+async def _execute(name: str, arguments: dict) -> tuple[str, bool]:
+    """Run one tool call; returns its serialized result and whether it is an error."""
+    if name not in _DISPATCH:
+        # Answer on the loop; no point queueing a worker thread for this
+        _observe(name, time.perf_counter(), cached=False, error=True)
+        return _dumps({"error": f"Unknown tool: {name}"}), True
+
+    error = _validate(name, arguments)
+    if error:
+        return _dumps(error), True
+
+    key = _call_key(name, arguments)
+    if key is None:
+        return await _run(_call_tool, name, arguments)
+
+    # Cache hits (the bulk of repeat capabilities/alert calls) are answered
+    # on the loop, without a round trip through the worker pool
+    if _cache_ttl(name) > 0:
+        started = time.perf_counter()
+        text = _cached_text(name, arguments, key)
+        if text is not None:
+            _observe(name, started, cached=True, error=False)
+            return text, False
+
+    # Identical calls that arrive while one is running wait for its answer
+    # instead of querying Observium again (e.g. an agent's retry)
+    future = _inflight.get(key)
+    if future is None:
+        future = _submit(_call_tool, name, arguments)
+        _inflight[key] = future
+        future.add_done_callback(lambda f: _inflight.pop(key, None))
+    # One caller being cancelled must not cancel the call for the others
+    return await asyncio.shield(future)
+
+
+# Result text for operations skipped by stop_on_error
+_SKIPPED = _dumps({"error": "Skipped after an earlier operation failed"})
+
+
+async def _batch_execute(arguments: dict) -> str:
+    """Run a batch_execute call's operations concurrently and combine their results."""
+    operations = arguments["operations"]
+    semaphore = asyncio.Semaphore(arguments.get("max_concurrent", 4))
+    stop_on_error = arguments.get("stop_on_error", False)
+    failed = False
+
+    async def run_one(index: int, op: dict) -> str:
+        nonlocal failed
+        tool = op["tool"]
+        async with semaphore:
+            if failed and stop_on_error:
+                text, is_error = _SKIPPED, True
+            else:
+                text, is_error = await _execute(tool, op.get("arguments") or {})
+                failed = failed or is_error
+
+        head = f'{{"index":{index},"tool":{_dumps(tool)}'
+        if is_error:
+            # Error results are small; unwrap them so the entry reads {"error": "..."}
+            return f'{head},"ok":false,"error":{_dumps(_loads(text).get("error"))}}}'
+        # The tool's output is already JSON; splice it in rather than re-encoding it
+        return f'{head},"ok":true,"result":{text}}}'
+
+    entries = await asyncio.gather(*(run_one(i, op) for i, op in enumerate(operations)))
+    return "[" + ",".join(entries) + "]"
+
+
+async def _batch_tool(arguments: dict) -> str:
+    """Entry point for batch_execute: validate, then run the operations."""
+    error = _validate("batch_execute", arguments)
+    return _dumps(error) if error else await _batch_execute(arguments)
+
+
+# Tools implemented on the event loop (coroutines taking the arguments and
+# returning JSON text); everything else goes through _execute and _DISPATCH
+_LOOP_TOOLS: dict[str, Callable[[dict], Any]] = {
+    "batch_execute": _batch_tool,
+}
+
+
+# Seconds a tool's serialized result is reused for identical arguments.
+# Agents re-ask the same questions while exploring, and Observium's data only
+# moves on poller timescales. Override with OBSERVIUM_CACHE_TTL_<TOOL>
+# (e.g. OBSERVIUM_CACHE_TTL_LIST_DEVICES=0 disables it for list_devices), or
+# for every tool at once with OBSERVIUM_CACHE_TTL.
+_DEFAULT_CACHE_TTL = {
+    "get_alert_summary": 5,
+    "list_alerts": 5,
+    "get_port_traffic": 10,
+    "get_ports_traffic": 10,
+    "list_devices": 30,
+    "list_sensors": 30,
+    "get_observium_capabilities": 30,
+    "get_trends": 60,
+    "list_available_metrics": 300,
+}
+
+# Entries are kept (fresh_until, text) for ttl + stale window seconds
+_tool_cache = TTLCache(maxsize=256)
+
+# Cache keys with a background refresh in flight
+_refreshing: set[tuple] = set()
+_refreshing_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def _cache_ttl(name: str) -> float:
+    """Get the result cache TTL for a tool (0 means no caching)."""
+    default = os.getenv("OBSERVIUM_CACHE_TTL", _DEFAULT_CACHE_TTL.get(name, 0))
+    return float(os.getenv(f"OBSERVIUM_CACHE_TTL_{name.upper()}", default))
+
+
+@functools.lru_cache(maxsize=None)
+def _cache_stale(name: str) -> float:
+    """
+    Get how long past its TTL a result may still be served while it is
+    refreshed in the background (defaults to the TTL itself).
+    """
+    return float(os.getenv("OBSERVIUM_CACHE_STALE", _cache_ttl(name)))
+
+
+# Tool calls currently running, by _call_key; only touched on the event loop
+_inflight: dict[tuple, asyncio.Future] = {}
+
+
+def _call_key(name: str, arguments: dict) -> Optional[tuple]:
+    """Build a hashable key for a tool call, or None if the arguments aren't hashable."""
+    try:
+        # List arguments (port_ids, fields, status_filter) are frozen into tuples
+        key = (name, tuple(sorted(
+            (k, tuple(v) if isinstance(v, list) else v) for k, v in arguments.items()
+        )))
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+if prometheus_client is not None:
+    _TOOL_LATENCY = prometheus_client.Histogram(
+        "observium_mcp_tool_seconds",
+        "Tool call latency, including cache lookup and serialization",
+        ["tool", "cached"],
+        buckets=(.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10),
+    )
+    _TOOL_ERRORS = prometheus_client.Counter(
+        "observium_mcp_tool_errors_total",
+        "Tool calls that returned an error result",
+        ["tool"],
+    )
+
+
+def _observe(name: str, started: float, cached: bool, error: bool) -> None:
+    """Record one tool call in the Prometheus metrics, if enabled."""
+    if prometheus_client is None:
+        return
+    # Unknown names come from clients; don't let them mint new label values
+    tool = name if name in _HANDLERS else "unknown"
+    _TOOL_LATENCY.labels(tool, "yes" if cached else "no").observe(time.perf_counter() - started)
+    if error:
+        _TOOL_ERRORS.labels(tool).inc()
+
+
+def start_metrics_server() -> None:
+    """Serve Prometheus metrics on OBSERVIUM_METRICS_PORT, if set."""
+    port = os.getenv("OBSERVIUM_METRICS_PORT")
+    if not port:
+        return
+    if prometheus_client is None:
+        # stdout carries the MCP protocol in stdio mode
+        print("OBSERVIUM_METRICS_PORT is set but prometheus_client is not installed",
+              file=sys.stderr)
+        return
+    prometheus_client.start_http_server(int(port))
+
+
+def start_pool_warmup() -> None:
+    """Open OBSERVIUM_DB_POOL_WARM database connections in the background, if set."""
+    if int(os.getenv("OBSERVIUM_DB_POOL_WARM", "0")) <= 0:
+        return
+
+    def warm() -> None:
+        from . import database
+        database.warm_pool()
+
+    # The handshakes overlap MCP initialization instead of the first tool calls
+    threading.Thread(target=warm, name="db-warmup", daemon=True).start()
+
+
+def _call_tool(name: str, arguments: dict) -> tuple[str, bool]:
+    """
+    Run a tool and serialize its result (runs in the worker pool).
+
+    Returns the JSON text and whether the result is an error.
+    """
+    started = time.perf_counter()
+    ttl = _cache_ttl(name)
+    key = _call_key(name, arguments) if ttl > 0 else None
+    if key is not None:
+        text = _cached_text(name, arguments, key)
+        if text is not None:
+            _observe(name, started, cached=True, error=False)
+            return text, False
+
+    text, error = _fetch_and_cache(name, arguments, key)
+    _observe(name, started, cached=False, error=error)
+    return text, error
+
+
+def _cached_text(name: str, arguments: dict, key: tuple) -> Optional[str]:
+    """Get a call's cached result text, or None; safe on the loop or in a worker."""
+    entry = _tool_cache.get(key)
+    if entry is None:
+        return None
+    fresh_until, text = entry
+    if time.monotonic() >= fresh_until:
+        # Stale-while-revalidate: answer now, refresh for the next caller
+        _schedule_refresh(name, arguments, key)
+    return text
+
+
+def _fetch_and_cache(name: str, arguments: dict, key: Optional[tuple]) -> tuple[str, bool]:
+    """Run a tool, serialize its result and cache it under key (if given)."""
+    result = _run_tool(name, arguments)
+    text = _dumps(result)
+    error = isinstance(result, dict) and "error" in result
+
+    # Errors (e.g. a database blip) are retried on the next call
+    if key is not None and not error:
+        ttl = _cache_ttl(name)
+        _tool_cache.set(key, (time.monotonic() + ttl, text), ttl + _cache_stale(name))
+    return text, error
+
+
+def _schedule_refresh(name: str, arguments: dict, key: tuple) -> None:
+    """Refresh a stale cache entry in the worker pool, once per key at a time."""
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def refresh():
+        try:
+            _fetch_and_cache(name, arguments, key)
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
 
     try:
-        if name == "get_observium_capabilities":
-            result = get_observium_capabilities()
-        elif name == "list_devices":
-            result = list_devices(
-                status_filter=arguments.get("status_filter"),
-                os_filter=arguments.get("os_filter")
-            )
-        elif name == "get_device":
-            result = get_device(
-                device_id=arguments.get("device_id"),
-                hostname=arguments.get("hostname")
-            )
-        elif name == "list_ports":
-            result = list_ports(
-                device_id=arguments.get("device_id"),
-                hostname=arguments.get("hostname"),
-                admin_status=arguments.get("admin_status"),
-                oper_status=arguments.get("oper_status")
-            )
-        elif name == "get_port_traffic":
-            result = get_port_traffic(
-                port_id=arguments.get("port_id"),
-                device_hostname=arguments.get("device_hostname"),
-                port_name=arguments.get("port_name"),
-                period=arguments.get("period", "1d")
-            )
-        elif name == "list_sensors":
-            result = list_sensors(
-                device_id=arguments.get("device_id"),
-                hostname=arguments.get("hostname"),
-                sensor_class=arguments.get("sensor_class")
-            )
-        elif name == "list_alerts":
-            result = list_alerts(
-                device_id=arguments.get("device_id"),
-                hostname=arguments.get("hostname"),
-                status=arguments.get("status", "active"),
-                limit=arguments.get("limit", 50)
-            )
-        elif name == "get_alert_summary":
-            result = get_alert_summary()
-        elif name == "get_trends":
-            result = get_trends(
-                device_id=arguments.get("device_id"),
-                hostname=arguments.get("hostname"),
-                metric=arguments.get("metric", "load"),
-                period=arguments.get("period", "1d")
-            )
-        elif name == "list_available_metrics":
-            result = list_available_metrics(
-                device_id=arguments.get("device_id"),
-                hostname=arguments.get("hostname")
-            )
-        else:
-            result = {"error": f"Unknown tool: {name}"}
+        _executor.submit(refresh)
+    except RuntimeError:  # Executor already shut down
+        with _refreshing_lock:
+            _refreshing.discard(key)
+
+
+# Tool name -> (function, argument names, defaults for omitted arguments)
+_HANDLERS: dict[str, tuple[Callable[..., Any], tuple[str, ...], dict[str, Any]]] = {
+    "get_observium_capabilities": (get_observium_capabilities, (), {}),
+    "list_devices": (
+        list_devices,
+        ("status_filter", "os_filter", "limit", "offset", "fields"),
+        {"limit": _DEFAULT_PAGE_SIZE, "offset": 0},
+    ),
+    "get_device": (get_device, ("device_id", "hostname"), {}),
+    "list_ports": (
+        list_ports,
+        ("device_id", "hostname", "admin_status", "oper_status", "limit", "offset", "fields"),
+        {"limit": _DEFAULT_PAGE_SIZE, "offset": 0},
+    ),
+    "get_port_traffic": (
+        get_port_traffic,
+        ("port_id", "device_hostname", "port_name", "period"),
+        {"period": "1d"},
+    ),
+    "get_ports_traffic": (get_ports_traffic, ("port_ids", "period"), {"period": "1d"}),
+    "list_sensors": (
+        list_sensors,
+        ("device_id", "hostname", "sensor_class", "status_filter", "limit", "offset", "fields"),
+        {"limit": _DEFAULT_PAGE_SIZE, "offset": 0},
+    ),
+    "list_alerts": (
+        list_alerts,
+        ("device_id", "hostname", "status", "limit", "offset", "before_ts", "before_id"),
+        {"status": "active", "limit": 50, "offset": 0},
+    ),
+    "get_alert_summary": (get_alert_summary, (), {}),
+    "get_trends": (
+        get_trends,
+        ("device_id", "hostname", "metric", "period", "max_points"),
+        {"metric": "load", "period": "1d", "max_points": 100},
+    ),
+    "list_available_metrics": (list_available_metrics, ("device_id", "hostname"), {}),
+    "get_tool_docs": (get_tool_docs, ("tool_name",), {}),
+}
+
+
+def _make_caller(
+    fn: Callable[..., Any], keys: tuple[str, ...], defaults: dict[str, Any]
+) -> Callable[[dict], Any]:
+    """Build a function that calls fn with its arguments picked out of a tool call's arguments."""
+    if not keys:
+        return lambda arguments: fn()
+
+    # (argument, default) pairs, so a call does one arguments.get per parameter
+    params = tuple((k, defaults.get(k)) for k in keys)
+
+    def call(arguments: dict) -> Any:
+        return fn(**{k: arguments.get(k, default) for k, default in params})
+
+    return call
+
+
+# Tool name -> caller taking the raw arguments dict, built once from _HANDLERS
+_DISPATCH: dict[str, Callable[[dict], Any]] = {
+    name: _make_caller(fn, keys, defaults) for name, (fn, keys, defaults) in _HANDLERS.items()
+}
+
+
+def _run_tool(name: str, arguments: dict) -> Any:
+    """Dispatch a tool call by name, turning exceptions into error results."""
+    caller = _DISPATCH.get(name)
+    if caller is None:
+        return {"error": f"Unknown tool: {name}"}
 
+    try:
+        result = caller(arguments)
     except Exception as e:
-        result = {"error": str(e)}
+        return {"error": str(e)}
 
-    return [TextContent(type="text", text=json.dumps(result, indent=2, default=str))]
+    fields = arguments.get("fields")
+    if fields and isinstance(result, list):
+        result = _select_fields(result, fields)
+    return result
+
+
+def _select_fields(rows: list, fields: list[str]) -> list:
+    """Trim each result row to the requested fields; error rows are kept whole."""
+    wanted = set(fields)
+    return [
+        {k: v for k, v in row.items() if k in wanted}
+        if isinstance(row, dict) and "error" not in row else row
+        for row in rows
+    ]
+
+
+# Built once all handlers above are registered (capabilities are derived from them)
+_INIT_OPTIONS = server.create_initialization_options()
+# Add server instructions to initialization
+_INIT_OPTIONS.instructions = SERVER_INSTRUCTIONS
+
+
+def _shutdown() -> None:
+    """Release worker threads, pooled connections and the rrdtool process."""
+    _executor.shutdown(wait=False, cancel_futures=True)
+    _fanout_executor.shutdown(wait=False, cancel_futures=True)
+    # Only modules a tool actually loaded have anything to release; importing
+    # them here would load PyMySQL just to close an empty pool
+    database = sys.modules.get(f"{__package__}.database")
+    if database is not None:
+        database.close_pool()
+    rrd = sys.modules.get(f"{__package__}.rrd")
+    if rrd is not None:
+        rrd.close_rrdtool_worker()
 
 
 async def main():
-    """Run the MCP server."""
+    """Run the MCP server over stdio."""
     async with stdio_server() as (read_stream, write_stream):
-        init_options = server.create_initialization_options()
-        # Add server instructions to initialization
-        init_options.instructions = SERVER_INSTRUCTIONS
-        await server.run(
-            read_stream,
-            write_stream,
-            init_options
-        )
+        try:
+            await server.run(
+                read_stream,
+                write_stream,
+                _INIT_OPTIONS
+            )
+        finally:
+            _shutdown()
+
+
+async def main_http(host: str = "127.0.0.1", port: int = 8000):
+    """
+    Run the MCP server over Streamable HTTP, served at /mcp.
+
+    All clients share this process's server instance, worker pools, database
+    pool and caches, so one client's lookups warm the cache for the others.
+    """
+    import contextlib
+
+    import uvicorn
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+    from starlette.applications import Starlette
+    from starlette.routing import Mount
+
+    # The session manager builds its own initialization options per session
+    server.instructions = SERVER_INSTRUCTIONS
+    session_manager = StreamableHTTPSessionManager(app=server)
+
+    async def handle_mcp(scope, receive, send):
+        await session_manager.handle_request(scope, receive, send)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        async with session_manager.run():
+            try:
+                yield
+            finally:
+                _shutdown()
+
+    app = Starlette(routes=[Mount("/mcp", app=handle_mcp)], lifespan=lifespan)
+    config = uvicorn.Config(app, host=host, port=port, log_level="warning")
+    await uvicorn.Server(config).serve()
 
 
 def run():
     """Entry point for the server."""
-    import asyncio
-    asyncio.run(main())
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="observium-mcp", description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--transport", choices=("stdio", "http"), default="stdio",
+        help="stdio for a single local client (default), http to serve several clients",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="HTTP bind address")
+    parser.add_argument("--port", type=int, default=8000, help="HTTP port")
+    args = parser.parse_args()
+
+    start_metrics_server()
+    start_pool_warmup()
+    if args.transport == "http":
+        asyncio.run(main_http(args.host, args.port))
+    else:
+        asyncio.run(main())
 
 
 if __name__ == "__main__":
@@ -1,17 +1,25 @@
 """MCP tools for Observium data access."""
 
-from .devices import list_devices, get_device
-from .ports import list_ports, get_port_traffic
-from .sensors import list_sensors
-from .alerts import list_alerts
-from .trends import get_trends
+import importlib
 
-__all__ = [
-    "list_devices",
-    "get_device",
-    "list_ports",
-    "get_port_traffic",
-    "list_sensors",
-    "list_alerts",
-    "get_trends",
-]
+# Submodules are imported on first attribute access (PEP 562), so importing
+# one tool module doesn't load all the others
+_EXPORTS = {
+    "list_devices": "devices",
+    "get_device": "devices",
+    "list_ports": "ports",
+    "get_port_traffic": "ports",
+    "get_ports_traffic": "ports",
+    "list_sensors": "sensors",
+    "list_alerts": "alerts",
+    "get_trends": "trends",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f".{module}", __name__), name)
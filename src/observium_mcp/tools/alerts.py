@@ -1,15 +1,64 @@
 """Alert-related MCP tools for Observium."""
 
+import functools
 from datetime import datetime
-from typing import Any, Optional
-from ..database import execute_query
+from typing import Any, Iterable, Optional
+from ..cache import TTLCache
+from ..database import execute_iter, execute_query, paginate
+from .devices import resolve_device_id
+
+# alert_test_id -> {"alert_name", "alert_message"}. Alert tests are edited
+# rarely, while many alerts share the same few tests.
+_alert_tests = TTLCache(4096)
+_ALERT_TEST_TTL = 300
+
+# list_alerts status filter -> SQL condition; 'all' (or anything else) adds none
+_STATUS_FILTER_SQL = {
+    "active": " AND a.alert_status = 1",
+    "recovered": " AND a.alert_status = 0",
+    "all": "",
+}
+
+
+def get_alert_tests(test_ids: Iterable[int]) -> dict[int, dict[str, Any]]:
+    """
+    Look up alert test names and messages, querying only uncached IDs.
+
+    IDs without a matching alert test map to an empty dict.
+    """
+    tests = {}
+    missing = []
+    for test_id in set(test_ids):
+        test = _alert_tests.get(test_id)
+        if test is None:
+            missing.append(test_id)
+        else:
+            tests[test_id] = test
+
+    if missing:
+        placeholders = ", ".join(["%s"] * len(missing))
+        rows = execute_query(
+            "SELECT alert_test_id, alert_name, alert_message FROM alert_tests"
+            f" WHERE alert_test_id IN ({placeholders})",
+            tuple(missing),
+        )
+        fetched = {row["alert_test_id"]: row for row in rows}
+        for test_id in missing:
+            test = fetched.get(test_id, {})
+            _alert_tests.set(test_id, test, _ALERT_TEST_TTL)
+            tests[test_id] = test
+
+    return tests
 
 
 def list_alerts(
     device_id: Optional[int] = None,
     hostname: Optional[str] = None,
     status: Optional[str] = None,
-    limit: int = 50
+    limit: int = 50,
+    offset: int = 0,
+    before_ts: Optional[int] = None,
+    before_id: Optional[int] = None
 ) -> list[dict[str, Any]]:
     """
     List alerts from Observium.
@@ -19,6 +68,12 @@ def list_alerts(
         hostname: Filter by hostname (used if device_id not provided)
         status: Filter by status ('active', 'recovered', 'all')
         limit: Maximum number of alerts to return (default: 50)
+        offset: Number of alerts to skip, for paging with limit
+        before_ts: Only alerts that last changed before this Unix time; pass
+                   the last_changed_unix of the previous page's last alert to
+                   page without OFFSET
+        before_id: With before_ts, the alert_id of that last alert, so alerts
+                   sharing its timestamp are not skipped
 
     Returns:
         List of alerts with status and details
@@ -37,38 +92,48 @@ def list_alerts(
             a.last_failed,
             a.ignore_until,
             d.hostname,
-            d.sysName,
-            t.alert_name,
-            t.alert_message
+            d.sysName
         FROM alert_table a
         JOIN devices d ON a.device_id = d.device_id
-        LEFT JOIN alert_tests t ON a.alert_test_id = t.alert_test_id
         WHERE d.disabled = 0
     """
     params = []
 
+    # A hostname is turned into its (cached) device_id, so the filter is an
+    # index lookup on a.device_id instead of an OR across two device columns
+    if device_id is None and hostname:
+        device_id = resolve_device_id(hostname)
+        if device_id is None:
+            return []
+
     if device_id is not None:
         query += " AND a.device_id = %s"
         params.append(device_id)
-    elif hostname:
-        query += " AND (d.hostname = %s OR d.sysName = %s)"
-        params.append(hostname)
-        params.append(hostname)
 
     if status:
-        if status.lower() == "active":
-            query += " AND a.alert_status = 1"
-        elif status.lower() == "recovered":
-            query += " AND a.alert_status = 0"
-        # 'all' returns everything, no filter needed
-
-    query += " ORDER BY a.last_changed DESC LIMIT %s"
-    params.append(limit)
+        query += _STATUS_FILTER_SQL.get(status.lower(), "")
+
+    # Keyset paging: the seek is an index range, unlike OFFSET, which reads
+    # and discards every skipped row
+    if before_ts is not None:
+        if before_id is not None:
+            query += " AND (a.last_changed < %s OR (a.last_changed = %s AND a.alert_table_id < %s))"
+            params.extend([before_ts, before_ts, before_id])
+        else:
+            query += " AND a.last_changed < %s"
+            params.append(before_ts)
 
-    results = execute_query(query, tuple(params))
+    # alert_table_id breaks ties so pages are stable
+    query += " ORDER BY a.last_changed DESC, a.alert_table_id DESC"
+    query = paginate(query, params, limit, offset)
 
+    # Rows are streamed and turned into alerts in one pass, so only one driver
+    # row is alive at a time; test names/messages are then looked up once per
+    # distinct test instead of being joined onto (and sent with) every row
     alerts = []
-    for row in results:
+    test_ids = []
+    for row in execute_iter(query, tuple(params)):
+        test_ids.append(row["alert_test_id"])
         # Convert Unix timestamps to readable format
         last_changed = format_timestamp(row.get("last_changed"))
         last_ok = format_timestamp(row.get("last_ok"))
@@ -81,8 +146,8 @@ def list_alerts(
             "sysname": row["sysName"],
             "entity_type": row["entity_type"],
             "entity_id": row["entity_id"],
-            "alert_name": row.get("alert_name"),
-            "message": row.get("alert_message"),
+            "alert_name": None,
+            "message": None,
             "status": "active" if row["alert_status"] == 1 else "recovered",
             "last_changed": last_changed,
             "last_ok": last_ok,
@@ -90,16 +155,25 @@ def list_alerts(
             "last_changed_unix": row.get("last_changed"),
         })
 
+    tests = get_alert_tests(test_id for test_id in test_ids if test_id is not None)
+    for alert, test_id in zip(alerts, test_ids):
+        test = tests.get(test_id, {})
+        alert["alert_name"] = test.get("alert_name")
+        alert["message"] = test.get("alert_message")
+
     return alerts
 
 
+# Alert timestamps repeat across calls (the same alerts are listed again and
+# again), so remember recent conversions instead of rebuilding datetimes
+@functools.lru_cache(maxsize=4096)
 def format_timestamp(unix_ts: Optional[int]) -> Optional[str]:
     """Convert Unix timestamp to ISO format string."""
     if unix_ts is None:
         return None
     try:
         return datetime.fromtimestamp(unix_ts).isoformat()
-    except (ValueError, OSError):
+    except (ValueError, OSError, OverflowError):
         return None
 
 
@@ -110,55 +184,60 @@ def get_alert_summary() -> dict[str, Any]:
     Returns:
         Summary with counts by status and entity type
     """
-    # Count by status
-    status_query = """
+    # One round trip. The first branch counts alerts per (status, entity type)
+    # in a single pass; both the status totals and the active by-entity
+    # breakdown are summed from it below. It reads no device columns, so it is
+    # a semi-join on the devices primary key rather than a full join.
+    # `kind` says which branch a row is from.
+    query = """
         SELECT
-            alert_status,
+            'entity_type' AS kind,
+            a.alert_status,
+            a.entity_type AS name,
             COUNT(*) as count
         FROM alert_table a
-        JOIN devices d ON a.device_id = d.device_id
-        WHERE d.disabled = 0
-        GROUP BY alert_status
+        WHERE EXISTS (
+            SELECT 1 FROM devices d WHERE d.device_id = a.device_id AND d.disabled = 0
+        )
+        GROUP BY a.alert_status, a.entity_type
+        UNION ALL
+        (
+            SELECT
+                'device',
+                NULL,
+                d.hostname,
+                COUNT(*) as count
+            FROM alert_table a
+            JOIN devices d ON a.device_id = d.device_id
+            WHERE d.disabled = 0 AND a.alert_status = 1
+            GROUP BY a.device_id, d.hostname
+            ORDER BY count DESC
+            LIMIT 10
+        )
     """
-    status_results = execute_query(status_query)
+    results = execute_query(query)
 
+    # UNION ALL doesn't preserve each branch's order, so sort per kind here
     status_counts = {"active": 0, "recovered": 0}
-    for row in status_results:
-        if row["alert_status"] == 1:
-            status_counts["active"] = row["count"]
+    entity_rows = []
+    device_rows = []
+    for row in results:
+        if row["kind"] == "entity_type":
+            if row["alert_status"] == 1:
+                status_counts["active"] += row["count"]
+                entity_rows.append(row)
+            else:
+                status_counts["recovered"] += row["count"]
         else:
-            status_counts["recovered"] = row["count"]
+            device_rows.append(row)
 
     # Count active alerts by entity type
-    entity_query = """
-        SELECT
-            entity_type,
-            COUNT(*) as count
-        FROM alert_table a
-        JOIN devices d ON a.device_id = d.device_id
-        WHERE d.disabled = 0 AND a.alert_status = 1
-        GROUP BY entity_type
-        ORDER BY count DESC
-    """
-    entity_results = execute_query(entity_query)
-
-    by_entity_type = {row["entity_type"]: row["count"] for row in entity_results}
+    entity_rows.sort(key=lambda row: row["count"], reverse=True)
+    by_entity_type = {row["name"]: row["count"] for row in entity_rows}
 
     # Count active alerts by device
-    device_query = """
-        SELECT
-            d.hostname,
-            COUNT(*) as count
-        FROM alert_table a
-        JOIN devices d ON a.device_id = d.device_id
-        WHERE d.disabled = 0 AND a.alert_status = 1
-        GROUP BY a.device_id, d.hostname
-        ORDER BY count DESC
-        LIMIT 10
-    """
-    device_results = execute_query(device_query)
-
-    by_device = {row["hostname"]: row["count"] for row in device_results}
+    device_rows.sort(key=lambda row: row["count"], reverse=True)
+    by_device = {row["name"]: row["count"] for row in device_rows}
 
     return {
         "total_active": status_counts["active"],
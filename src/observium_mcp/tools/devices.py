@@ -1,7 +1,8 @@
 """Device-related MCP tools for Observium."""
 
 from typing import Any, Optional
-from ..database import execute_query, execute_single
+from ..cache import ttl_cache
+from ..database import execute_iter, execute_single, paginate
 
 
 def format_uptime(seconds: Optional[int]) -> str:
@@ -21,19 +22,93 @@ def format_uptime(seconds: Optional[int]) -> str:
         return f"{minutes}m"
 
 
+_STATUS_NAMES = {
+    0: "down",
+    1: "up",
+    2: "disabled",
+}
+_STATUS_CODES = {name: code for code, name in _STATUS_NAMES.items()}
+
+
 def format_status(status: int) -> str:
     """Format device status code to human-readable string."""
-    status_map = {
-        0: "down",
-        1: "up",
-        2: "disabled",
-    }
-    return status_map.get(status, f"unknown ({status})")
+    return _STATUS_NAMES.get(status, f"unknown ({status})")
+
+
+def _escape_like(text: str) -> str:
+    """Escape LIKE metacharacters so text matches literally."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+# SQL equivalents of format_status and format_uptime, for list queries
+_STATUS_LABEL_SQL = (
+    "COALESCE(ELT(status + 1, 'down', 'up', 'disabled'), CONCAT('unknown (', status, ')'))"
+)
+_UPTIME_TEXT_SQL = """
+    CASE
+        WHEN uptime IS NULL THEN 'Unknown'
+        WHEN uptime >= 86400 THEN CONCAT(
+            uptime DIV 86400, 'd ', uptime MOD 86400 DIV 3600, 'h ', uptime MOD 3600 DIV 60, 'm')
+        WHEN uptime >= 3600 THEN CONCAT(uptime DIV 3600, 'h ', uptime MOD 3600 DIV 60, 'm')
+        ELSE CONCAT(uptime DIV 60, 'm')
+    END
+"""
+
+# list_devices output field -> SQL expression, in output order
+_DEVICE_COLUMNS = {
+    "device_id": "device_id",
+    "hostname": "hostname",
+    "sysname": "sysName",
+    "os": "os",
+    "version": "version",
+    "hardware": "hardware",
+    "status": _STATUS_LABEL_SQL,
+    "uptime": _UPTIME_TEXT_SQL,
+    "uptime_seconds": "uptime",
+    "last_polled": "CAST(last_polled AS CHAR)",
+    "location": "location",
+}
+
+
+def _found(value: Any) -> bool:
+    """Only cache lookups that matched a device, so new devices show up at once."""
+    return value is not None
+
+
+# Two single-column lookups instead of `hostname = %s OR sysName = %s`, which
+# MySQL often can't serve from indexes; an exact hostname match wins over a
+# sysName match
+_DEVICE_BY_NAME_SQL = """
+    SELECT device_id, 0 AS preference FROM devices WHERE hostname = %s
+    UNION ALL
+    SELECT device_id, 1 AS preference FROM devices WHERE sysName = %s
+    ORDER BY preference
+    LIMIT 1
+"""
+
+
+# Hostnames and device_ids are stable; caching the mapping saves a round trip
+# on every tool call that names a device by hostname
+@ttl_cache(ttl=300, should_cache=_found)
+def resolve_device_id(hostname: str) -> Optional[int]:
+    """Get the device_id for a hostname or sysName, or None if there is no such device."""
+    row = execute_single(_DEVICE_BY_NAME_SQL, (hostname, hostname))
+    return row["device_id"] if row else None
+
+
+@ttl_cache(ttl=300, should_cache=_found)
+def resolve_hostname(device_id: int) -> Optional[str]:
+    """Get the hostname for a device_id, or None if there is no such device."""
+    row = execute_single("SELECT hostname FROM devices WHERE device_id = %s", (device_id,))
+    return row["hostname"] if row else None
 
 
 def list_devices(
     status_filter: Optional[str] = None,
-    os_filter: Optional[str] = None
+    os_filter: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    fields: Optional[list[str]] = None
 ) -> list[dict[str, Any]]:
     """
     List all devices monitored by Observium.
@@ -41,58 +116,44 @@ def list_devices(
     Args:
         status_filter: Filter by status ('up', 'down', 'disabled')
         os_filter: Filter by OS type (e.g., 'linux', 'ios', 'junos')
+        limit: Maximum number of devices to return (default: all)
+        offset: Number of devices to skip, for paging with limit
+        fields: Only select these output fields (default: all); unknown
+                names are ignored
 
     Returns:
         List of devices with basic status information
     """
-    query = """
+    # Rows come back already in output shape, so there is no per-row Python work.
+    # Only requested columns are read, so e.g. location isn't sent when unused.
+    columns = [c for c in _DEVICE_COLUMNS if c in fields] if fields else []
+    select = ",\n            ".join(
+        f"{_DEVICE_COLUMNS[c]} AS {c}" for c in columns or _DEVICE_COLUMNS
+    )
+    query = f"""
         SELECT
-            device_id,
-            hostname,
-            sysName,
-            os,
-            version,
-            hardware,
-            status,
-            uptime,
-            last_polled,
-            location
+            {select}
         FROM devices
         WHERE disabled = 0
     """
     params = []
 
     if status_filter:
-        status_code = {"up": 1, "down": 0, "disabled": 2}.get(status_filter.lower())
+        status_code = _STATUS_CODES.get(status_filter.lower())
         if status_code is not None:
             query += " AND status = %s"
             params.append(status_code)
 
     if os_filter:
+        # Substring match on the literal text; % and _ in the filter aren't wildcards
         query += " AND os LIKE %s"
-        params.append(f"%{os_filter}%")
+        params.append(f"%{_escape_like(os_filter)}%")
 
     query += " ORDER BY hostname"
+    query = paginate(query, params, limit, offset)
 
-    results = execute_query(query, tuple(params) if params else None)
-
-    devices = []
-    for row in results:
-        devices.append({
-            "device_id": row["device_id"],
-            "hostname": row["hostname"],
-            "sysname": row["sysName"],
-            "os": row["os"],
-            "version": row["version"],
-            "hardware": row["hardware"],
-            "status": format_status(row["status"]),
-            "uptime": format_uptime(row["uptime"]),
-            "uptime_seconds": row["uptime"],
-            "last_polled": str(row["last_polled"]) if row["last_polled"] else None,
-            "location": row["location"],
-        })
-
-    return devices
+    # Streamed: rows go straight into the result without a buffered copy
+    return list(execute_iter(query, params or None))
 
 
 def get_device(device_id: Optional[int] = None, hostname: Optional[str] = None) -> dict[str, Any]:
@@ -109,64 +170,49 @@ def get_device(device_id: Optional[int] = None, hostname: Optional[str] = None)
     if device_id is None and hostname is None:
         return {"error": "Either device_id or hostname must be provided"}
 
+    # The related counts come back in the same round trip as the device row
     query = """
         SELECT
-            device_id,
-            hostname,
-            sysName,
-            sysDescr,
-            sysContact,
-            os,
-            version,
-            hardware,
-            vendor,
-            serial,
-            features,
-            status,
-            status_type,
-            uptime,
-            last_polled,
-            last_discovered,
-            last_polled_timetaken,
-            location,
-            purpose,
-            type,
-            ip,
-            snmp_version
-        FROM devices
-        WHERE 1=1
+            d.device_id,
+            d.hostname,
+            d.sysName,
+            d.sysDescr,
+            d.sysContact,
+            d.os,
+            d.version,
+            d.hardware,
+            d.vendor,
+            d.serial,
+            d.features,
+            d.status,
+            d.status_type,
+            d.uptime,
+            d.last_polled,
+            d.last_discovered,
+            d.last_polled_timetaken,
+            d.location,
+            d.purpose,
+            d.type,
+            d.ip,
+            d.snmp_version,
+            (SELECT COUNT(*) FROM ports p WHERE p.device_id = d.device_id) AS port_count,
+            (SELECT COUNT(*) FROM sensors s WHERE s.device_id = d.device_id) AS sensor_count,
+            (SELECT COUNT(*) FROM alert_table a
+             WHERE a.device_id = d.device_id AND a.alert_status = 1) AS alert_count
+        FROM devices d
+        WHERE d.device_id = %s
     """
 
-    if device_id is not None:
-        query += " AND device_id = %s"
-        params = (device_id,)
-    else:
-        query += " AND (hostname = %s OR sysName = %s)"
-        params = (hostname, hostname)
+    if device_id is None:
+        device_id = resolve_device_id(hostname)
+        if device_id is None:
+            return {"error": "Device not found"}
 
-    row = execute_single(query, params)
+    row = execute_single(query, (device_id,))
 
     if not row:
         return {"error": "Device not found"}
 
-    # Get port count
-    port_query = "SELECT COUNT(*) as count FROM ports WHERE device_id = %s"
-    port_result = execute_single(port_query, (row["device_id"],))
-    port_count = port_result["count"] if port_result else 0
-
-    # Get sensor count
-    sensor_query = "SELECT COUNT(*) as count FROM sensors WHERE device_id = %s"
-    sensor_result = execute_single(sensor_query, (row["device_id"],))
-    sensor_count = sensor_result["count"] if sensor_result else 0
-
-    # Get active alert count
-    alert_query = """
-        SELECT COUNT(*) as count FROM alert_table
-        WHERE device_id = %s AND alert_status = 1
-    """
-    alert_result = execute_single(alert_query, (row["device_id"],))
-    alert_count = alert_result["count"] if alert_result else 0
-
     return {
         "device_id": row["device_id"],
         "hostname": row["hostname"],
@@ -191,7 +237,7 @@ def get_device(device_id: Optional[int] = None, hostname: Optional[str] = None)
         "type": row["type"],
         "ip": row["ip"],
         "snmp_version": row["snmp_version"],
-        "port_count": port_count,
-        "sensor_count": sensor_count,
-        "active_alert_count": alert_count,
+        "port_count": row["port_count"],
+        "sensor_count": row["sensor_count"],
+        "active_alert_count": row["alert_count"],
     }
@@ -1,45 +1,93 @@
 """Port-related MCP tools for Observium."""
 
+import functools
 import os
 from typing import Any, Optional
-from ..database import execute_query, execute_single
-from ..rrd import get_rrd_path, fetch_rrd_data, rrd_file_exists, list_device_rrd_files
-
-
+from ..database import execute_iter, execute_query, execute_single, paginate
+from ..rrd import get_rrd_path, fetch_rrd_data, fetch_rrd_files, probe_rrd_files
+from .devices import resolve_device_id
+
+
+# Tool period -> rrdtool start time
+_PERIOD_MAP = {
+    "1h": "-1h",
+    "6h": "-6h",
+    "1d": "-1d",
+    "1w": "-1w",
+    "1m": "-1m",
+}
+
+
+# (divisor, unit) for each power of 1000 bps / 1024 bytes
+_SPEED_UNITS = (
+    (1, "bps"),
+    (1_000, "Kbps"),
+    (1_000_000, "Mbps"),
+    (1_000_000_000, "Gbps"),
+    (1_000_000_000_000, "Tbps"),
+)
+_BYTE_UNITS = tuple((1024 ** i, unit) for i, unit in enumerate(["B", "KB", "MB", "GB", "TB", "PB"]))
+
+
+# Ports cluster on a handful of speeds (1G, 10G, ...), so results repeat
+@functools.lru_cache(maxsize=256)
 def format_speed(speed: Optional[int]) -> str:
     """Format port speed in bps to human-readable string."""
     if speed is None or speed == 0:
         return "Unknown"
-
-    if speed >= 1_000_000_000_000:
-        return f"{speed / 1_000_000_000_000:.0f} Tbps"
-    elif speed >= 1_000_000_000:
-        return f"{speed / 1_000_000_000:.0f} Gbps"
-    elif speed >= 1_000_000:
-        return f"{speed / 1_000_000:.0f} Mbps"
-    elif speed >= 1_000:
-        return f"{speed / 1_000:.0f} Kbps"
-    else:
+    if speed < 1_000:
         return f"{speed} bps"
 
+    # Number of decimal digits picks the unit without walking the thresholds
+    idx = min((len(str(int(speed))) - 1) // 3, len(_SPEED_UNITS) - 1)
+    divisor, unit = _SPEED_UNITS[idx]
+    return f"{speed / divisor:.0f} {unit}"
+
 
 def format_bytes(bytes_val: Optional[float]) -> str:
     """Format bytes to human-readable string."""
     if bytes_val is None:
         return "N/A"
 
-    for unit in ["B", "KB", "MB", "GB", "TB"]:
-        if abs(bytes_val) < 1024:
-            return f"{bytes_val:.2f} {unit}"
-        bytes_val /= 1024
-    return f"{bytes_val:.2f} PB"
+    # Every 10 bits is one step of 1024
+    idx = max(0, min((int(abs(bytes_val)).bit_length() - 1) // 10, len(_BYTE_UNITS) - 1))
+    divisor, unit = _BYTE_UNITS[idx]
+    return f"{bytes_val / divisor:.2f} {unit}"
+
+
+# list_ports output field -> SQL expression, in output order. ifHighSpeed is
+# in Mbps and wins over ifSpeed (bps) when set; speed is formatted in Python.
+_PORT_COLUMNS = {
+    "port_id": "p.port_id",
+    "device_id": "p.device_id",
+    "hostname": "d.hostname",
+    "name": "COALESCE(NULLIF(p.ifName, ''), p.ifDescr)",
+    "description": "p.ifDescr",
+    "alias": "p.ifAlias",
+    "speed": "NULL",
+    "speed_bps": """CASE
+                WHEN p.ifHighSpeed > 0 THEN p.ifHighSpeed * 1000000
+                WHEN p.ifSpeed <> 0 THEN p.ifSpeed
+            END""",
+    "admin_status": "p.ifAdminStatus",
+    "oper_status": "p.ifOperStatus",
+    "in_octets": "p.ifInOctets",
+    "out_octets": "p.ifOutOctets",
+    "in_errors": "p.ifInErrors",
+    "out_errors": "p.ifOutErrors",
+    "type": "p.ifType",
+    "mtu": "p.ifMtu",
+}
 
 
 def list_ports(
     device_id: Optional[int] = None,
     hostname: Optional[str] = None,
     admin_status: Optional[str] = None,
-    oper_status: Optional[str] = None
+    oper_status: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    fields: Optional[list[str]] = None
 ) -> list[dict[str, Any]]:
     """
     List network ports for a device.
@@ -49,40 +97,34 @@ def list_ports(
         hostname: The hostname to get ports for (used if device_id not provided)
         admin_status: Filter by admin status ('up', 'down')
         oper_status: Filter by operational status ('up', 'down')
+        limit: Maximum number of ports to return (default: all)
+        offset: Number of ports to skip, for paging with limit
+        fields: Only select these output fields (default: all); unknown
+                names are ignored
 
     Returns:
         List of ports with status and basic traffic info
     """
     # First, resolve hostname to device_id if needed
     if device_id is None and hostname:
-        device_query = "SELECT device_id FROM devices WHERE hostname = %s OR sysName = %s"
-        result = execute_single(device_query, (hostname, hostname))
-        if result:
-            device_id = result["device_id"]
-        else:
+        device_id = resolve_device_id(hostname)
+        if device_id is None:
             return [{"error": f"Device not found: {hostname}"}]
 
     if device_id is None:
         return [{"error": "Either device_id or hostname must be provided"}]
 
-    query = """
+    # Columns come back already named and ordered as in the tool output; only
+    # the formatted speed is filled in per row, from speed_bps
+    columns = [c for c in _PORT_COLUMNS if c in fields] if fields else list(_PORT_COLUMNS)
+    if not columns:
+        columns = list(_PORT_COLUMNS)
+    elif "speed" in columns and "speed_bps" not in columns:
+        columns.insert(columns.index("speed") + 1, "speed_bps")
+    select = ",\n            ".join(f"{_PORT_COLUMNS[c]} AS {c}" for c in columns)
+    query = f"""
         SELECT
-            p.port_id,
-            p.device_id,
-            p.ifDescr,
-            p.ifName,
-            p.ifAlias,
-            p.ifSpeed,
-            p.ifHighSpeed,
-            p.ifAdminStatus,
-            p.ifOperStatus,
-            p.ifInOctets,
-            p.ifOutOctets,
-            p.ifInErrors,
-            p.ifOutErrors,
-            p.ifType,
-            p.ifMtu,
-            d.hostname
+            {select}
         FROM ports p
         JOIN devices d ON p.device_id = d.device_id
         WHERE p.device_id = %s
@@ -98,40 +140,44 @@ def list_ports(
         params.append(oper_status.lower())
 
     query += " ORDER BY p.ifIndex"
+    query = paginate(query, params, limit, offset)
 
-    results = execute_query(query, tuple(params))
-
+    # The driver's row dicts are returned as-is rather than copied key by key
     ports = []
-    for row in results:
-        # Use ifHighSpeed (in Mbps) if available, otherwise ifSpeed (in bps)
-        speed = None
-        if row.get("ifHighSpeed") and row["ifHighSpeed"] > 0:
-            speed = row["ifHighSpeed"] * 1_000_000  # Convert Mbps to bps
-        elif row.get("ifSpeed"):
-            speed = row["ifSpeed"]
-
-        ports.append({
-            "port_id": row["port_id"],
-            "device_id": row["device_id"],
-            "hostname": row["hostname"],
-            "name": row["ifName"] or row["ifDescr"],
-            "description": row["ifDescr"],
-            "alias": row.get("ifAlias"),
-            "speed": format_speed(speed),
-            "speed_bps": speed,
-            "admin_status": row["ifAdminStatus"],
-            "oper_status": row["ifOperStatus"],
-            "in_octets": row["ifInOctets"],
-            "out_octets": row["ifOutOctets"],
-            "in_errors": row["ifInErrors"],
-            "out_errors": row["ifOutErrors"],
-            "type": row["ifType"],
-            "mtu": row["ifMtu"],
-        })
+    with_speed = "speed" in columns
+    for row in execute_iter(query, tuple(params)):
+        if with_speed:
+            row["speed"] = format_speed(row["speed_bps"])
+        ports.append(row)
 
     return ports
 
 
+# Port details needed for a traffic report; callers append the WHERE clause
+_PORT_TRAFFIC_SQL = """
+    SELECT
+        p.port_id,
+        p.device_id,
+        p.ifDescr,
+        p.ifName,
+        p.ifAlias,
+        p.ifSpeed,
+        p.ifHighSpeed,
+        p.ifAdminStatus,
+        p.ifOperStatus,
+        p.ifInOctets,
+        p.ifOutOctets,
+        p.ifInOctets_rate,
+        p.ifOutOctets_rate,
+        p.ifInOctets_perc,
+        p.ifOutOctets_perc,
+        p.ifIndex,
+        d.hostname
+    FROM ports p
+    JOIN devices d ON p.device_id = d.device_id
+"""
+
+
 def get_port_traffic(
     port_id: Optional[int] = None,
     device_hostname: Optional[str] = None,
@@ -150,67 +196,100 @@ def get_port_traffic(
     Returns:
         Traffic statistics including current rate and historical data
     """
-    # Resolve port_id if not provided
-    if port_id is None:
-        if device_hostname is None or port_name is None:
-            return {"error": "Either port_id or (device_hostname and port_name) must be provided"}
-
-        query = """
-            SELECT p.port_id, p.ifDescr, p.ifName, d.hostname
-            FROM ports p
-            JOIN devices d ON p.device_id = d.device_id
-            WHERE (d.hostname = %s OR d.sysName = %s)
-            AND (p.ifName = %s OR p.ifDescr = %s)
-        """
-        result = execute_single(query, (device_hostname, device_hostname, port_name, port_name))
-        if result:
-            port_id = result["port_id"]
-        else:
+    if port_id is None and (device_hostname is None or port_name is None):
+        return {"error": "Either port_id or (device_hostname and port_name) must be provided"}
+
+    # Get port details; a port given by name is resolved in the same query
+    if port_id is not None:
+        port = execute_single(_PORT_TRAFFIC_SQL + " WHERE p.port_id = %s", (port_id,))
+        if not port:
+            return {"error": f"Port not found: {port_id}"}
+    else:
+        device_id = resolve_device_id(device_hostname)
+        port = None
+        if device_id is not None:
+            port = execute_single(
+                _PORT_TRAFFIC_SQL + " WHERE p.device_id = %s AND (p.ifName = %s OR p.ifDescr = %s)",
+                (device_id, port_name, port_name),
+            )
+        if not port:
             return {"error": f"Port not found: {port_name} on {device_hostname}"}
 
-    # Get port details
-    port_query = """
-        SELECT
-            p.port_id,
-            p.device_id,
-            p.ifDescr,
-            p.ifName,
-            p.ifAlias,
-            p.ifSpeed,
-            p.ifHighSpeed,
-            p.ifAdminStatus,
-            p.ifOperStatus,
-            p.ifInOctets,
-            p.ifOutOctets,
-            p.ifInOctets_rate,
-            p.ifOutOctets_rate,
-            p.ifInOctets_perc,
-            p.ifOutOctets_perc,
-            d.hostname
-        FROM ports p
-        JOIN devices d ON p.device_id = d.device_id
-        WHERE p.port_id = %s
+    result = _port_traffic_result(port)
+
+    # Try to get historical data from RRD
+    rrd_file = _find_port_rrd_files([port]).get(port["port_id"])
+    if rrd_file:
+        rrd_data = fetch_rrd_data(rrd_file, start=_PERIOD_MAP.get(period, "-1d"))
+        _add_historical(result, port, rrd_file, rrd_data, period)
+
+    return result
+
+
+def get_ports_traffic(port_ids: list[int], period: str = "1d") -> list[dict[str, Any]]:
     """
-    port = execute_single(port_query, (port_id,))
+    Get traffic statistics for several ports at once.
+
+    The ports are read in one query, their RRD files probed once per device
+    and fetched concurrently, so a multi-port report costs about as much as
+    the slowest single port rather than the sum of all of them.
 
-    if not port:
-        return {"error": f"Port not found: {port_id}"}
+    Args:
+        port_ids: The port IDs to get traffic for
+        period: Time period for historical data ('1h', '6h', '1d', '1w', '1m')
+
+    Returns:
+        One get_port_traffic result per port ID, in the order given
+    """
+    if not port_ids:
+        return [{"error": "port_ids must not be empty"}]
+
+    unique_ids = list(dict.fromkeys(port_ids))
+    placeholders = ", ".join(["%s"] * len(unique_ids))
+    ports = {
+        row["port_id"]: row
+        for row in execute_query(
+            _PORT_TRAFFIC_SQL + f" WHERE p.port_id IN ({placeholders})", tuple(unique_ids)
+        )
+    }
 
-    # Calculate speed
-    speed = None
+    rrd_files = _find_port_rrd_files(list(ports.values()))
+    rrd_data = fetch_rrd_files(list(rrd_files.values()), start=_PERIOD_MAP.get(period, "-1d"))
+
+    results = []
+    for port_id in port_ids:
+        port = ports.get(port_id)
+        if port is None:
+            results.append({"error": f"Port not found: {port_id}"})
+            continue
+        result = _port_traffic_result(port)
+        rrd_file = rrd_files.get(port_id)
+        if rrd_file:
+            _add_historical(result, port, rrd_file, rrd_data[rrd_file], period)
+        results.append(result)
+
+    return results
+
+
+def _port_speed(port: dict[str, Any]) -> Optional[int]:
+    """Port speed in bps; ifHighSpeed (Mbps) wins over ifSpeed when set."""
     if port.get("ifHighSpeed") and port["ifHighSpeed"] > 0:
-        speed = port["ifHighSpeed"] * 1_000_000
+        return port["ifHighSpeed"] * 1_000_000
     elif port.get("ifSpeed"):
-        speed = port["ifSpeed"]
+        return port["ifSpeed"]
+    return None
 
-    result = {
+
+def _port_traffic_result(port: dict[str, Any]) -> dict[str, Any]:
+    """Build the current-traffic part of a get_port_traffic result from a port row."""
+    return {
         "port_id": port["port_id"],
         "device_id": port["device_id"],
         "hostname": port["hostname"],
         "name": port["ifName"] or port["ifDescr"],
         "description": port["ifDescr"],
         "alias": port.get("ifAlias"),
-        "speed": format_speed(speed),
+        "speed": format_speed(_port_speed(port)),
         "admin_status": port["ifAdminStatus"],
         "oper_status": port["ifOperStatus"],
         "current": {
@@ -223,61 +302,66 @@ def get_port_traffic(
         }
     }
 
-    # Try to get historical data from RRD
-    period_map = {
-        "1h": "-1h",
-        "6h": "-6h",
-        "1d": "-1d",
-        "1w": "-1w",
-        "1m": "-1m",
+
+def _find_port_rrd_files(ports: list[dict[str, Any]]) -> dict[int, str]:
+    """
+    Find the traffic RRD file of each port.
+
+    Observium may use different naming conventions: port-{ifIndex}.rrd or
+    port-{port_id}.rrd. Only the candidates are probed, one probe (one SSH
+    round trip in remote mode) per device; the directory is never listed
+    unless its listing is already cached.
+
+    Returns:
+        Dictionary mapping port_id to its RRD file path, for ports that have one
+    """
+    by_host: dict[str, list[tuple[int, list[str]]]] = {}
+    for port in ports:
+        candidates = []
+        if port.get("ifIndex"):
+            candidates.append(f"port-{port['ifIndex']}.rrd")
+        candidates.append(f"port-{port['port_id']}.rrd")
+        by_host.setdefault(port["hostname"], []).append((port["port_id"], candidates))
+
+    found = {}
+    for hostname, host_ports in by_host.items():
+        rrd_base = os.path.join(get_rrd_path(), hostname)
+        existing = probe_rrd_files(
+            hostname, list(dict.fromkeys(c for _, candidates in host_ports for c in candidates))
+        )
+        for port_id, candidates in host_ports:
+            for candidate in candidates:
+                if existing[candidate]:
+                    found[port_id] = os.path.join(rrd_base, candidate)
+                    break
+    return found
+
+
+def _add_historical(
+    result: dict[str, Any],
+    port: dict[str, Any],
+    rrd_file: str,
+    rrd_data: dict[str, Any],
+    period: str
+) -> None:
+    """Add the historical section for a fetched RRD file to a traffic result."""
+    if "error" in rrd_data:
+        return
+
+    # Calculate statistics including peak values
+    historical = {
+        "period": period,
+        "rrd_file": os.path.basename(rrd_file),
+        "datasources": rrd_data.get("datasources", []),
+        "data_points": len(rrd_data.get("timestamps", [])),
     }
-    rrd_start = period_map.get(period, "-1d")
-
-    # Find the correct RRD file - Observium may use different naming conventions
-    # Try: port-{ifIndex}.rrd, port-{port_id}.rrd
-    rrd_base = os.path.join(get_rrd_path(), port["hostname"])
-    rrd_file = None
-
-    # Get ifIndex from database
-    ifindex_query = "SELECT ifIndex FROM ports WHERE port_id = %s"
-    ifindex_result = execute_single(ifindex_query, (port_id,))
-    ifindex = ifindex_result.get("ifIndex") if ifindex_result else None
-
-    # Try different RRD file naming patterns
-    candidates = []
-    if ifindex:
-        candidates.append(f"port-{ifindex}.rrd")
-    candidates.append(f"port-{port['port_id']}.rrd")
-
-    # Also check available RRD files to find a match
-    device_rrds = list_device_rrd_files(port["hostname"])
-    port_rrds = [f for f in device_rrds if f.startswith("port-") and not f.startswith("port-ipv6")]
-
-    for candidate in candidates:
-        candidate_path = os.path.join(rrd_base, candidate)
-        if rrd_file_exists(candidate_path):
-            rrd_file = candidate_path
-            break
 
-    if rrd_file:
-        rrd_data = fetch_rrd_data(rrd_file, start=rrd_start)
-        if "error" not in rrd_data:
-            # Calculate statistics including peak values
-            historical = {
-                "period": period,
-                "rrd_file": os.path.basename(rrd_file),
-                "datasources": rrd_data.get("datasources", []),
-                "data_points": len(rrd_data.get("timestamps", [])),
-            }
-
-            # Calculate peak and average for in/out traffic
-            stats = calculate_port_stats(rrd_data, speed)
-            if stats:
-                historical["statistics"] = stats
-
-            result["historical"] = historical
+    # Calculate peak and average for in/out traffic
+    stats = calculate_port_stats(rrd_data, _port_speed(port))
+    if stats:
+        historical["statistics"] = stats
 
-    return result
+    result["historical"] = historical
 
 
 def calculate_port_stats(rrd_data: dict, port_speed_bps: Optional[int]) -> dict:
@@ -285,12 +369,28 @@ def calculate_port_stats(rrd_data: dict, port_speed_bps: Optional[int]) -> dict:
     stats = {}
     datasources = rrd_data.get("datasources", [])
     data = rrd_data.get("data", [])
-    timestamps = rrd_data.get("timestamps", [])
 
     if not data or not datasources:
         return stats
 
-    # Find indices for INOCTETS and OUTOCTETS datasources
+    in_idx, out_idx = _find_inout_idx(tuple(datasources))
+
+    # Peak and average for each direction, in bits/sec. A direction without
+    # a column is skipped without scanning data; both are found whenever
+    # there are two or more datasources.
+    for direction, idx in (("in", in_idx), ("out", out_idx)):
+        if idx is not None:
+            direction_stats = _rate_stats(data, idx, port_speed_bps)
+            if direction_stats:
+                stats[direction] = direction_stats
+
+    return stats
+
+
+# Port RRDs share a few DS layouts, so the name scan is done once per layout
+@functools.lru_cache(maxsize=256)
+def _find_inout_idx(datasources: tuple[str, ...]) -> tuple[Optional[int], Optional[int]]:
+    """Find the indices of the INOCTETS and OUTOCTETS datasources."""
     in_idx = None
     out_idx = None
     for i, ds in enumerate(datasources):
@@ -305,46 +405,24 @@ def calculate_port_stats(rrd_data: dict, port_speed_bps: Optional[int]) -> dict:
         in_idx = 0
     if out_idx is None and len(datasources) >= 2:
         out_idx = 1
+    return in_idx, out_idx
 
-    # Calculate stats for inbound traffic
-    if in_idx is not None:
-        in_values = []
-        for row in data:
-            if in_idx < len(row) and row[in_idx] is not None:
-                # Convert bytes/sec to bits/sec
-                in_values.append(row[in_idx] * 8)
-
-        if in_values:
-            peak_in = max(in_values)
-            avg_in = sum(in_values) / len(in_values)
-            stats["in"] = {
-                "peak_bps": peak_in,
-                "peak_mbps": peak_in / 1_000_000,
-                "avg_bps": avg_in,
-                "avg_mbps": avg_in / 1_000_000,
-            }
-            if port_speed_bps and port_speed_bps > 0:
-                stats["in"]["peak_utilization_pct"] = (peak_in / port_speed_bps) * 100
-                stats["in"]["avg_utilization_pct"] = (avg_in / port_speed_bps) * 100
-
-    # Calculate stats for outbound traffic
-    if out_idx is not None:
-        out_values = []
-        for row in data:
-            if out_idx < len(row) and row[out_idx] is not None:
-                out_values.append(row[out_idx] * 8)
-
-        if out_values:
-            peak_out = max(out_values)
-            avg_out = sum(out_values) / len(out_values)
-            stats["out"] = {
-                "peak_bps": peak_out,
-                "peak_mbps": peak_out / 1_000_000,
-                "avg_bps": avg_out,
-                "avg_mbps": avg_out / 1_000_000,
-            }
-            if port_speed_bps and port_speed_bps > 0:
-                stats["out"]["peak_utilization_pct"] = (peak_out / port_speed_bps) * 100
-                stats["out"]["avg_utilization_pct"] = (avg_out / port_speed_bps) * 100
 
-    return stats
+def _rate_stats(data: list, idx: int, port_speed_bps: Optional[int]) -> Optional[dict]:
+    """Peak/average of one octet-rate column, converted to bits/sec."""
+    values = [v for row in data if idx < len(row) and (v := row[idx]) is not None]
+    if not values:
+        return None
+
+    peak = max(values) * 8
+    avg = sum(values) * 8 / len(values)
+    result = {
+        "peak_bps": peak,
+        "peak_mbps": peak / 1_000_000,
+        "avg_bps": avg,
+        "avg_mbps": avg / 1_000_000,
+    }
+    if port_speed_bps and port_speed_bps > 0:
+        result["peak_utilization_pct"] = (peak / port_speed_bps) * 100
+        result["avg_utilization_pct"] = (avg / port_speed_bps) * 100
+    return result
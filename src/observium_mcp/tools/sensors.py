@@ -1,13 +1,77 @@
 """Sensor-related MCP tools for Observium."""
 
+import math
 from typing import Any, Optional
-from ..database import execute_query
+from ..database import execute_iter, execute_query, paginate
+from .devices import resolve_device_id
+
+SENSOR_STATUSES = ("normal", "critical_high", "critical_low", "warning_high", "warning_low")
+
+# A sensor's status from its value and limits, evaluated by the database both
+# for the status column and for status filters. Unset (NULL or 0) limits
+# never trigger.
+_STATUS_SQL = """
+    CASE
+        WHEN s.sensor_value IS NULL THEN 'normal'
+        WHEN s.sensor_limit <> 0 AND s.sensor_value > s.sensor_limit THEN 'critical_high'
+        WHEN s.sensor_limit_low <> 0 AND s.sensor_value < s.sensor_limit_low THEN 'critical_low'
+        WHEN s.sensor_limit_warn <> 0 AND s.sensor_value > s.sensor_limit_warn THEN 'warning_high'
+        WHEN s.sensor_limit_low_warn <> 0
+            AND s.sensor_value < s.sensor_limit_low_warn THEN 'warning_low'
+        ELSE 'normal'
+    END
+"""
+
+
+# list_sensors output field -> SQL expression, in output order. The NULL
+# placeholders keep the key order and are filled in per row; limits is built
+# from the _LIMIT_COLUMNS, which are selected under hidden _<name> aliases.
+_SENSOR_COLUMNS = {
+    "sensor_id": "s.sensor_id",
+    "device_id": "s.device_id",
+    "hostname": "d.hostname",
+    "sysname": "d.sysName",
+    "class": "s.sensor_class",
+    "type": "s.sensor_type",
+    "description": "s.sensor_descr",
+    "value": "s.sensor_value",
+    "value_formatted": "NULL",
+    "unit": "s.sensor_unit",
+    "status": _STATUS_SQL,
+    "limits": "NULL",
+}
+_LIMIT_COLUMNS = {
+    "critical_high": "s.sensor_limit",
+    "critical_low": "s.sensor_limit_low",
+    "warning_high": "s.sensor_limit_warn",
+    "warning_low": "s.sensor_limit_low_warn",
+}
+# Computed fields -> the selected fields they are derived from
+_SENSOR_DEPENDS = {
+    "value_formatted": ("value", "class", "unit"),
+}
+
+
+def _expand_statuses(status_filter: list[str]) -> list[str]:
+    """Expand 'warning'/'critical' to their _high and _low variants."""
+    statuses = []
+    for status in status_filter:
+        status = status.lower()
+        if status in ("warning", "critical"):
+            statuses += [f"{status}_high", f"{status}_low"]
+        elif status in SENSOR_STATUSES:
+            statuses.append(status)
+    return statuses
 
 
 def list_sensors(
     device_id: Optional[int] = None,
     hostname: Optional[str] = None,
-    sensor_class: Optional[str] = None
+    sensor_class: Optional[str] = None,
+    status_filter: Optional[list[str]] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    fields: Optional[list[str]] = None
 ) -> list[dict[str, Any]]:
     """
     List sensors for a device or all devices.
@@ -16,124 +80,108 @@ def list_sensors(
         device_id: Filter by device ID
         hostname: Filter by hostname (used if device_id not provided)
         sensor_class: Filter by sensor class (e.g., 'temperature', 'voltage', 'frequency')
+        status_filter: Only return sensors in these states (e.g. ['warning', 'critical']
+                       or ['critical_high']); evaluated in the database
+        limit: Maximum number of sensors to return (default: all)
+        offset: Number of sensors to skip, for paging with limit
+        fields: Only build these output fields (default: all); unknown names
+                are ignored. Fields a requested one is derived from may be
+                included too.
 
     Returns:
         List of sensors with current values
     """
-    query = """
+    wanted = {c for c in _SENSOR_COLUMNS if c in fields} if fields else set(_SENSOR_COLUMNS)
+    if not wanted:
+        wanted = set(_SENSOR_COLUMNS)
+    selected = set(wanted)
+    for field in wanted & _SENSOR_DEPENDS.keys():
+        selected.update(_SENSOR_DEPENDS[field])
+    with_formatted = "value_formatted" in wanted
+    with_limits = "limits" in wanted
+
+    # Aliases are quoted: class, type, value and status are all SQL keywords
+    columns = [f"{sql} AS `{name}`" for name, sql in _SENSOR_COLUMNS.items() if name in selected]
+    if with_limits:
+        columns += [f"{sql} AS `_{name}`" for name, sql in _LIMIT_COLUMNS.items()]
+    select = ",\n            ".join(columns)
+    query = f"""
         SELECT
-            s.sensor_id,
-            s.device_id,
-            s.sensor_class,
-            s.sensor_type,
-            s.sensor_descr,
-            s.sensor_value,
-            s.sensor_unit,
-            s.sensor_limit,
-            s.sensor_limit_low,
-            s.sensor_limit_warn,
-            s.sensor_limit_low_warn,
-            d.hostname,
-            d.sysName
+            {select}
         FROM sensors s
         JOIN devices d ON s.device_id = d.device_id
         WHERE d.disabled = 0 AND s.sensor_deleted = 0
     """
     params = []
 
+    # A hostname is turned into its (cached) device_id, so the filter is an
+    # index lookup on s.device_id instead of an OR across two device columns
+    if device_id is None and hostname:
+        device_id = resolve_device_id(hostname)
+        if device_id is None:
+            return []
+
     if device_id is not None:
         query += " AND s.device_id = %s"
         params.append(device_id)
-    elif hostname:
-        query += " AND (d.hostname = %s OR d.sysName = %s)"
-        params.append(hostname)
-        params.append(hostname)
 
     if sensor_class:
         query += " AND s.sensor_class = %s"
         params.append(sensor_class.lower())
 
-    query += " ORDER BY d.hostname, s.sensor_class, s.sensor_descr"
+    if status_filter:
+        statuses = _expand_statuses(status_filter)
+        if not statuses:
+            return []
+        query += f" AND {_STATUS_SQL} IN ({', '.join(['%s'] * len(statuses))})"
+        params.extend(statuses)
 
-    results = execute_query(query, tuple(params) if params else None)
+    query += " ORDER BY d.hostname, s.sensor_class, s.sensor_descr"
+    query = paginate(query, params, limit, offset)
 
+    # The driver's row dicts are completed in place; fields the caller didn't
+    # ask for are never computed
     sensors = []
-    for row in results:
-        # Determine status based on limits
-        status = "normal"
-        value = row.get("sensor_value")
-
-        if value is not None:
-            # Check critical limits
-            if row.get("sensor_limit") and value > row["sensor_limit"]:
-                status = "critical_high"
-            elif row.get("sensor_limit_low") and value < row["sensor_limit_low"]:
-                status = "critical_low"
-            # Check warning limits
-            elif row.get("sensor_limit_warn") and value > row["sensor_limit_warn"]:
-                status = "warning_high"
-            elif row.get("sensor_limit_low_warn") and value < row["sensor_limit_low_warn"]:
-                status = "warning_low"
-
-        # Format value with unit
-        formatted_value = format_sensor_value(
-            value,
-            row["sensor_class"],
-            row.get("sensor_unit")
-        )
-
-        sensors.append({
-            "sensor_id": row["sensor_id"],
-            "device_id": row["device_id"],
-            "hostname": row["hostname"],
-            "sysname": row["sysName"],
-            "class": row["sensor_class"],
-            "type": row["sensor_type"],
-            "description": row["sensor_descr"],
-            "value": value,
-            "value_formatted": formatted_value,
-            "unit": row.get("sensor_unit"),
-            "status": status,
-            "limits": {
-                "critical_high": row.get("sensor_limit"),
-                "critical_low": row.get("sensor_limit_low"),
-                "warning_high": row.get("sensor_limit_warn"),
-                "warning_low": row.get("sensor_limit_low_warn"),
-            }
-        })
+    for row in execute_iter(query, tuple(params) if params else None):
+        if with_limits:
+            row["limits"] = {name: row.pop(f"_{name}") for name in _LIMIT_COLUMNS}
+        if with_formatted:
+            row["value_formatted"] = format_sensor_value(row["value"], row["class"], row["unit"])
+        sensors.append(row)
 
     return sensors
 
 
+# Sensor class -> format for its value; frequency scales its unit separately
+_VALUE_FORMATS = {
+    "temperature": "{:.1f}°C",
+    "humidity": "{:.1f}%",
+    "voltage": "{:.2f}V",
+    "current": "{:.2f}A",
+    "power": "{:.1f}W",
+    "fanspeed": "{:.0f} RPM",
+    "load": "{:.1f}%",
+}
+_FREQUENCY_UNITS = ((1, "Hz"), (1_000, "KHz"), (1_000_000, "MHz"), (1_000_000_000, "GHz"))
+
+
 def format_sensor_value(value: Optional[float], sensor_class: str, unit: Optional[str] = None) -> str:
     """Format sensor value based on its class."""
     if value is None:
         return "N/A"
 
     # Class-specific formatting
-    if sensor_class == "temperature":
-        return f"{value:.1f}°C"
-    elif sensor_class == "humidity":
-        return f"{value:.1f}%"
-    elif sensor_class == "voltage":
-        return f"{value:.2f}V"
-    elif sensor_class == "current":
-        return f"{value:.2f}A"
-    elif sensor_class == "power":
-        return f"{value:.1f}W"
+    fmt = _VALUE_FORMATS.get(sensor_class)
+    if fmt is not None:
+        return fmt.format(value)
     elif sensor_class == "frequency":
-        if value >= 1_000_000_000:
-            return f"{value / 1_000_000_000:.2f} GHz"
-        elif value >= 1_000_000:
-            return f"{value / 1_000_000:.2f} MHz"
-        elif value >= 1_000:
-            return f"{value / 1_000:.2f} KHz"
-        else:
-            return f"{value:.2f} Hz"
-    elif sensor_class == "fanspeed":
-        return f"{value:.0f} RPM"
-    elif sensor_class == "load":
-        return f"{value:.1f}%"
+        # Number of integer digits picks the unit, as in ports.format_speed
+        idx = 0
+        if value >= 1_000:
+            last = len(_FREQUENCY_UNITS) - 1
+            idx = min((len(str(int(value))) - 1) // 3, last) if value < math.inf else last
+        divisor, unit = _FREQUENCY_UNITS[idx]
+        return f"{value / divisor:.2f} {unit}"
     elif unit:
         return f"{value} {unit}"
     else:
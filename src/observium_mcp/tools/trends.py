@@ -1,23 +1,61 @@
 """Trend/historical data MCP tools for Observium."""
 
 import os
+import re
 from typing import Any, Optional
-from ..database import execute_single
 from ..rrd import (
-    get_rrd_path,
     get_device_rrd_path,
     list_device_rrd_files,
     fetch_rrd_data,
-    get_rrd_info,
     rrd_file_exists,
 )
+from .devices import resolve_hostname
+
+
+# Tool period -> rrdtool start time
+_PERIOD_MAP = {
+    "1h": "-1h",
+    "6h": "-6h",
+    "1d": "-1d",
+    "1w": "-1w",
+    "1m": "-1m",
+}
+
+# Metric -> RRD file holding it
+_METRIC_FILES = {
+    "load": "la.rrd",
+    "cpu": "processor-hr-1.rrd",
+    "memory": "mempool-ucd-snmp-mib--0.rrd",
+    "uptime": "uptime.rrd",
+}
+
+# Metric -> substring of other RRD files that can stand in for a missing one
+_METRIC_ALTERNATIVES = {
+    "cpu": "processor",
+    "memory": "mempool",
+}
+
+# Substrings that sort RRD files into list_available_metrics' categories,
+# checked in this order; anything else is "other"
+_CATEGORY_RRDS = {
+    "system": ("la.rrd", "processor", "mempool", "hr_", "uptime"),
+    "network": ("port-", "netstats", "ip"),
+    "sensors": ("sensor", "alert-7"),
+    "performance": ("perf", "poller"),
+}
+# One search per category, tried in _CATEGORY_RRDS order
+_CATEGORY_RES = tuple(
+    (category, re.compile("|".join(map(re.escape, substrings))).search)
+    for category, substrings in _CATEGORY_RRDS.items()
+)
 
 
 def get_trends(
     device_id: Optional[int] = None,
     hostname: Optional[str] = None,
     metric: str = "load",
-    period: str = "1d"
+    period: str = "1d",
+    max_points: int = 100
 ) -> dict[str, Any]:
     """
     Get historical trend data for a device metric.
@@ -31,45 +69,32 @@ def get_trends(
                 - 'memory': Memory usage
                 - 'uptime': Device uptime history
         period: Time period ('1h', '6h', '1d', '1w', '1m')
+        max_points: Maximum samples to return; longer series are thinned
+                    evenly across the period, always keeping the latest one
 
     Returns:
-        Historical data with timestamps and values
+        Historical data in columnar form: one list of timestamps and one
+        list of values per datasource, aligned by index
     """
     # Resolve hostname if device_id provided
     if hostname is None and device_id is not None:
-        query = "SELECT hostname FROM devices WHERE device_id = %s"
-        result = execute_single(query, (device_id,))
-        if result:
-            hostname = result["hostname"]
-        else:
+        hostname = resolve_hostname(device_id)
+        if hostname is None:
             return {"error": f"Device not found: {device_id}"}
 
     if hostname is None:
         return {"error": "Either device_id or hostname must be provided"}
 
     # Map period to rrdtool format
-    period_map = {
-        "1h": "-1h",
-        "6h": "-6h",
-        "1d": "-1d",
-        "1w": "-1w",
-        "1m": "-1m",
-    }
-    rrd_start = period_map.get(period, "-1d")
+    rrd_start = _PERIOD_MAP.get(period, "-1d")
 
     # Map metric to RRD file
-    metric_files = {
-        "load": "la.rrd",
-        "cpu": "processor-hr-1.rrd",
-        "memory": "mempool-ucd-snmp-mib--0.rrd",
-        "uptime": "uptime.rrd",
-    }
-
-    rrd_filename = metric_files.get(metric.lower())
+    metric_key = metric.lower()
+    rrd_filename = _METRIC_FILES.get(metric_key)
     if not rrd_filename:
         return {
             "error": f"Unknown metric: {metric}",
-            "available_metrics": list(metric_files.keys())
+            "available_metrics": list(_METRIC_FILES)
         }
 
     # Build full path
@@ -79,12 +104,8 @@ def get_trends(
     if not rrd_file_exists(rrd_file):
         # Try to find alternative RRD files for this metric
         device_rrds = list_device_rrd_files(hostname)
-        alternatives = []
-
-        if metric.lower() == "cpu":
-            alternatives = [f for f in device_rrds if "processor" in f.lower()]
-        elif metric.lower() == "memory":
-            alternatives = [f for f in device_rrds if "mempool" in f.lower()]
+        pattern = _METRIC_ALTERNATIVES.get(metric_key)
+        alternatives = [f for f in device_rrds if pattern in f.lower()] if pattern else []
 
         if alternatives:
             rrd_file = os.path.join(get_device_rrd_path(hostname), alternatives[0])
@@ -100,45 +121,57 @@ def get_trends(
     if "error" in data:
         return data
 
-    # Process and summarize the data
-    values = []
-    for i, ts in enumerate(data.get("timestamps", [])):
-        row_values = data["data"][i] if i < len(data["data"]) else []
-        # Filter out None values and create data points
-        point = {"timestamp": ts}
-        for j, ds in enumerate(data.get("datasources", [])):
-            if j < len(row_values) and row_values[j] is not None:
-                point[ds] = row_values[j]
-        if len(point) > 1:  # Has at least one value besides timestamp
-            values.append(point)
+    datasources = data.get("datasources", [])
+    timestamps = data.get("timestamps", [])
+    rows = data.get("data", [])
+
+    # Indexes of samples with at least one value
+    kept = [i for i, row in enumerate(rows) if row.count(None) < len(row)]
+    data_points = len(kept)
+    kept = downsample(kept, max_points)
 
     # Calculate statistics
-    stats = calculate_stats(values, data.get("datasources", []))
+    stats = calculate_stats(datasources, rows)
 
+    # Columnar shape: the keys appear once instead of once per point
+    columns = list(zip(*(rows[i] for i in kept))) or [()] * len(datasources)
     return {
         "hostname": hostname,
         "metric": metric,
         "period": period,
         "rrd_file": os.path.basename(rrd_file),
-        "datasources": data.get("datasources", []),
-        "data_points": len(values),
+        "datasources": datasources,
+        "data_points": data_points,
         "statistics": stats,
-        "data": values[-100:] if len(values) > 100 else values  # Limit to last 100 points
+        "data": {
+            "timestamps": [timestamps[i] for i in kept],
+            "series": {ds: list(col) for ds, col in zip(datasources, columns)},
+        },
     }
 
 
-def calculate_stats(values: list[dict], datasources: list[str]) -> dict[str, Any]:
-    """Calculate min, max, avg for each datasource."""
+def downsample(items: list, max_points: int) -> list:
+    """Pick at most max_points evenly strided items, always including the last."""
+    max_points = max(1, max_points)
+    if len(items) <= max_points:
+        return items
+    stride = -(-len(items) // max_points)  # ceil division
+    # Start at the offset that lands a step exactly on the last item
+    return items[(len(items) - 1) % stride::stride]
+
+
+def calculate_stats(datasources: list[str], rows: list[list[Optional[float]]]) -> dict[str, Any]:
+    """Calculate min, max, avg and current value for each datasource."""
     stats = {}
 
-    for ds in datasources:
-        ds_values = [v[ds] for v in values if ds in v and v[ds] is not None]
+    for ds, column in zip(datasources, zip(*rows)):
+        ds_values = [v for v in column if v is not None]
         if ds_values:
             stats[ds] = {
                 "min": min(ds_values),
                 "max": max(ds_values),
                 "avg": sum(ds_values) / len(ds_values),
-                "current": ds_values[-1] if ds_values else None,
+                "current": ds_values[-1],
             }
 
     return stats
@@ -160,11 +193,8 @@ def list_available_metrics(
     """
     # Resolve hostname if device_id provided
     if hostname is None and device_id is not None:
-        query = "SELECT hostname FROM devices WHERE device_id = %s"
-        result = execute_single(query, (device_id,))
-        if result:
-            hostname = result["hostname"]
-        else:
+        hostname = resolve_hostname(device_id)
+        if hostname is None:
             return {"error": f"Device not found: {device_id}"}
 
     if hostname is None:
@@ -180,24 +210,15 @@ def list_available_metrics(
         }
 
     # Categorize RRD files
-    categories = {
-        "system": [],
-        "network": [],
-        "sensors": [],
-        "performance": [],
-        "other": []
-    }
+    categories = {category: [] for category in _CATEGORY_RRDS}
+    categories["other"] = []
 
     for rrd in rrd_files:
         rrd_lower = rrd.lower()
-        if any(x in rrd_lower for x in ["la.rrd", "processor", "mempool", "hr_", "uptime"]):
-            categories["system"].append(rrd)
-        elif any(x in rrd_lower for x in ["port-", "netstats", "ip"]):
-            categories["network"].append(rrd)
-        elif "sensor" in rrd_lower or "alert-7" in rrd_lower:
-            categories["sensors"].append(rrd)
-        elif "perf" in rrd_lower or "poller" in rrd_lower:
-            categories["performance"].append(rrd)
+        for category, search in _CATEGORY_RES:
+            if search(rrd_lower):
+                categories[category].append(rrd)
+                break
         else:
             categories["other"].append(rrd)
 